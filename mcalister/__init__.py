@@ -0,0 +1,4 @@
+#
+# Post-processing of the McAlister wing overset simulations. Each module
+# is a command (see the project scripts), run it with python -m
+# mcalister.<module> or the mcalister-* commands.
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+#
+# This makes a dataframe containing a temporal average of navg last slices
+# along with the covariances (Reynolds stresses, pressure variance) and rms
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import argparse
+import multiprocessing
+import numpy as np
+from mcalister import utilities
+from mcalister import manifest
+from mcalister import profiling
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_stat_pairs(columns):
+    """Return the pairs of fields for the covariances"""
+    renames = utilities.get_renames()
+    vel = [c for c in ["velocity_:0", "velocity_:1", "velocity_:2"] if c in columns]
+    pairs = [(a, b) for i, a in enumerate(vel) for b in vel[i:]]
+    if "pressure" in columns:
+        pairs.append(("pressure", "pressure"))
+    return {renames[a] + renames[b]: (a, b) for a, b in pairs}
+
+
+# ========================================================================
+def init_stats(df, pairs):
+    """Statistics of a single time step"""
+    import pandas as pd
+
+    df = df.groupby(["Points:0", "Points:1", "Points:2"]).mean()
+    return {
+        "n": pd.Series(1, index=df.index),
+        "mean": df,
+        "cov": pd.DataFrame(0.0, index=df.index, columns=list(pairs)),
+    }
+
+
+# ========================================================================
+def merge_stats(a, b, pairs):
+    """Merge two sets of statistics (Chan et al. pairwise update)
+
+    This is used to add one time step to the running statistics as well
+    as to combine the partial statistics of different workers.
+    """
+    if a is None:
+        return b
+    if not a["mean"].index.equals(b["mean"].index):
+        index = a["mean"].index.union(b["mean"].index)
+        a = {key: val.reindex(index, fill_value=0) for key, val in a.items()}
+        b = {key: val.reindex(index, fill_value=0) for key, val in b.items()}
+
+    n = a["n"] + b["n"]
+    delta = b["mean"] - a["mean"]
+    mean = a["mean"] + delta.mul(b["n"] / n, axis=0)
+    cov = a["cov"] + b["cov"]
+    weight = a["n"] * b["n"] / n
+    for name, (x, y) in pairs.items():
+        cov[name] += delta[x] * delta[y] * weight
+
+    return {"n": n, "mean": mean, "cov": cov}
+
+
+# ========================================================================
+def accumulate_stats(steps):
+    """Streaming statistics over a list of (time index, shard files)
+
+    The next step is read while the current one is reduced, so the read
+    stage only measures the time spent waiting for the data.
+    """
+    stats = None
+    reader = utilities.iter_merged_csv(steps)
+    for _ in steps:
+        with profiling.stage("read") as info:
+            time, df = next(reader)
+            info["step"] = time
+            info["rows"] = len(df)
+        df["time"] = time
+        with profiling.stage("reduce", step=time):
+            pairs = get_stat_pairs(df.columns)
+            stats = merge_stats(stats, init_stats(df, pairs), pairs)
+    return stats
+
+
+# ========================================================================
+def get_batches(steps, nbatch):
+    """Split the steps in (at most) nbatch contiguous batches"""
+    bounds = np.linspace(0, len(steps), nbatch + 1).astype(int)
+    return [steps[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+# ========================================================================
+def accumulate_batches(batches):
+    """Streaming statistics over a list of batches of steps
+
+    Returns the statistics of all the steps and the statistics of the
+    batch means, in which the mean of each batch counts as one sample.
+    Only the running statistics and the current batch are in memory.
+    """
+    import pandas as pd
+
+    stats = None
+    bstats = None
+    for batch in batches:
+        partial = accumulate_stats(batch)
+        pairs = get_stat_pairs(partial["mean"].columns)
+        stats = merge_stats(stats, partial, pairs)
+        index = partial["mean"].index
+        bmean = {
+            "n": pd.Series(1, index=index),
+            "mean": partial["mean"],
+            "cov": pd.DataFrame(0.0, index=index, columns=list(pairs)),
+        }
+        bstats = merge_stats(bstats, bmean, pairs)
+    return stats, bstats
+
+
+# ========================================================================
+def accumulate_worker(batches):
+    """accumulate_batches in a worker process, with its profiling stages"""
+    return profiling.collect(accumulate_batches, batches)
+
+
+# ========================================================================
+def finalize_stats(stats, pairs, bstats=None):
+    """Dataframe of the means, covariances and rms of the fields
+
+    With the statistics of the batch means, the standard errors of the
+    means (<x>_se) are added: the standard deviation of the batch means
+    divided by the square root of the number of batches.
+    """
+    renames = utilities.get_renames()
+    df = stats["mean"].copy()
+    cov = stats["cov"].div(stats["n"], axis=0)
+    for name, (x, y) in pairs.items():
+        df[name] = cov[name]
+        if x == y:
+            df[renames[x] + "_rms"] = np.sqrt(cov[name])
+    if bstats is not None:
+        nb = bstats["n"].where(bstats["n"] > 1)
+        bvar = bstats["cov"].div(nb - 1, axis=0)
+        for name, (x, y) in pairs.items():
+            if x == y:
+                df[renames[x] + "_se"] = np.sqrt(bvar[name].div(nb))
+    return df.reset_index()
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Average the slices of a case"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Average slices over time")
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-n", "--navg", help="Number of time steps to average over", type=int, default=1
+    )
+    parser.add_argument(
+        "-p", "--nprocs", help="Number of worker processes", type=int, default=1
+    )
+    parser.add_argument(
+        "-b",
+        "--nbatch",
+        help="Number of batches for the standard errors",
+        type=int,
+        default=10,
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    # Setup
+    fdir = os.path.abspath(args.folder)
+    oname = os.path.join(fdir, "avg_slice.csv")
+    prefix = "output"
+    suffix = ".csv"
+
+    # Get time steps, keep only last navg steps
+    with profiling.stage("manifest", folder=fdir):
+        steps = manifest.get_step_files(
+            manifest.get_manifest(fdir, prefix, suffix), args.navg
+        )
+
+    # Accumulate the statistics in a single pass over the time steps
+    # (batches split across workers and merged)
+    batches = get_batches(steps, args.nbatch)
+    chunks = get_batches(batches, args.nprocs)
+    if len(chunks) == 1:
+        partials = [accumulate_batches(batches)]
+    else:
+        config = profiling.get_worker_config()
+        with multiprocessing.Pool(
+            len(chunks), profiling.init_worker, (config,)
+        ) as pool:
+            partials = []
+            for partial, events in pool.map(accumulate_worker, chunks):
+                profiling.merge(events)
+                partials.append(partial)
+    stats, bstats = None, None
+    for partial, bpartial in partials:
+        pairs = get_stat_pairs(partial["mean"].columns)
+        stats = merge_stats(stats, partial, pairs)
+        bstats = merge_stats(bstats, bpartial, pairs)
+
+    # Average, covariances, rms and standard errors
+    avgdf = finalize_stats(stats, pairs, bstats)
+
+    # Output to file
+    with profiling.stage("write", folder=fdir) as info:
+        avgdf.to_csv(oname, index=False)
+        info["rows"] = len(avgdf)
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+#
+# This generates a synthetic McAlister case and times the post-processing
+# stages on it
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import numpy as np
+from mcalister import definitions as defs
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def naca_contour(npts, thickness=0.15):
+    """Return a closed NACA 4-digit symmetric airfoil contour"""
+    beta = np.linspace(0, 2 * np.pi, npts, endpoint=False)
+    x = 0.5 * (1 + np.cos(beta))
+    yt = (
+        5
+        * thickness
+        * (
+            0.2969 * np.sqrt(x)
+            - 0.1260 * x
+            - 0.3516 * x ** 2
+            + 0.2843 * x ** 3
+            - 0.1036 * x ** 4
+        )
+    )
+    y = np.where(beta < np.pi, yt, -yt)
+    return x, y
+
+
+# ========================================================================
+def write_shards(df, odir, step, nranks):
+    """Split a slice dataframe into per-rank shards of a time step"""
+    for rank, idx in enumerate(np.array_split(np.arange(len(df)), nranks)):
+        # ranks share the points at their boundary
+        if rank > 0:
+            idx = np.insert(idx, 0, idx[0] - 1)
+        df.iloc[idx].to_csv(
+            os.path.join(odir, f"output{rank}.{step}.csv"), index=False
+        )
+
+
+# ========================================================================
+def generate_case(cdir, aoa=12, npts=2000, nsteps=10, nranks=4, nforces=1000):
+    """Generate a synthetic run folder in cdir
+
+    The folder contains a minimal mcalister.yaml, a forces.dat, and wing
+    and vortex slice shards with the same layout and column names as
+    the ParaView output of pp_wing.py and pp_vortex.py. npts is the
+    number of points per time step of each slice folder, split across
+    the slices and the rank shards.
+    """
+    import pandas as pd
+    import yaml
+
+    rng = np.random.default_rng(0)
+    os.makedirs(cdir, exist_ok=True)
+    alpha = np.radians(aoa)
+    c, s = np.cos(alpha), np.sin(alpha)
+    u0, v0, rho0, mu = float(46.0 * c), float(46.0 * s), 1.225, 0.00003756
+    dt, freq = 0.004, 50
+
+    # Input file
+    inp = {
+        "realms": [
+            {
+                "name": "realm_1",
+                "mesh": "McAlisterSingleBlock.exo",
+                "automatic_decomposition_type": "rcb",
+                "initial_conditions": [
+                    {
+                        "constant": "ic_1",
+                        "target_name": ["base-HEX"],
+                        "value": {"pressure": 0, "velocity": [u0, v0, 0.0]},
+                    }
+                ],
+                "material_properties": {
+                    "target_name": ["base-HEX"],
+                    "specifications": [
+                        {"name": "density", "type": "constant", "value": rho0},
+                        {"name": "viscosity", "type": "constant", "value": mu},
+                    ],
+                },
+                "output": {
+                    "output_data_base_name": "out/mcalister.e",
+                    "output_frequency": freq,
+                },
+            }
+        ],
+        "Time_Integrators": [
+            {
+                "StandardTimeIntegrator": {
+                    "name": "ti_1",
+                    "start_time": 0,
+                    "time_step": dt,
+                    "termination_step_count": nforces,
+                    "time_stepping_type": "fixed",
+                }
+            }
+        ],
+    }
+    with open(os.path.join(cdir, "mcalister.yaml"), "w") as f:
+        yaml.safe_dump(inp, f, default_flow_style=False, sort_keys=False)
+
+    # Forces
+    t = dt * np.arange(1, nforces + 1)
+    qS = 0.5 * rho0 * 46.0 ** 2 * defs.get_wing_area(3)
+    cl = 1.0 + 0.02 * np.sin(2 * np.pi * 5 * t) + 0.005 * rng.normal(size=nforces)
+    cd = 0.05 + 0.002 * rng.normal(size=nforces)
+    fx, fy = qS * (cd * c - cl * s), qS * (cd * s + cl * c)
+    forces = pd.DataFrame(
+        {
+            "Time": t,
+            "Fpx": 0.9 * fx,
+            "Fpy": 0.9 * fy,
+            "Fpz": 0.0,
+            "Fvx": 0.1 * fx,
+            "Fvy": 0.1 * fy,
+            "Fvz": 0.0,
+        }
+    )
+    forces.to_csv(os.path.join(cdir, "forces.dat"), sep=" ", index=False)
+
+    # Wing slices
+    wdir = os.path.join(cdir, "wing_slices")
+    os.makedirs(wdir, exist_ok=True)
+    zslices = defs.get_wing_slices(3)
+    npts_slice = max(npts // len(zslices), 16)
+    xc, yc = naca_contour(npts_slice)
+    xw = c * (xc - 0.25) + s * yc + 0.25
+    yw = -s * (xc - 0.25) + c * yc
+    wing = []
+    segments = []
+    for z in zslices:
+        wing.append(pd.DataFrame({"Points:0": xw, "Points:1": yw, "Points:2": z}))
+        segments.append(
+            pd.DataFrame(
+                {
+                    "x0": xw,
+                    "y0": yw,
+                    "z0": z,
+                    "x1": np.roll(xw, -1),
+                    "y1": np.roll(yw, -1),
+                    "z1": z,
+                }
+            )
+        )
+    wing = pd.concat(wing, ignore_index=True)
+    pd.concat(segments, ignore_index=True).to_csv(
+        os.path.join(wdir, "segments.csv"), index=False
+    )
+    cp = np.tile(1 - 4 * xc * (1 - xc) * (1 + np.sign(yc)), len(zslices))
+
+    # Vortex slices (Lamb-Oseen vortex in the plane normal to the flow)
+    vdir = os.path.join(cdir, "vortex_slices")
+    os.makedirs(vdir, exist_ok=True)
+    hwl = defs.get_half_wing_length()
+    vortex = []
+    for xslice in defs.get_vortex_slices():
+        n = max(npts // len(defs.get_vortex_slices()), 16)
+        xr = np.full(n, 1.0 + xslice)
+        yr = rng.uniform(-0.5, 2.0, n)
+        z = rng.uniform(hwl - 1.0, hwl + 1.0, n)
+        vortex.append(
+            pd.DataFrame(
+                {
+                    "Points:0": c * (xr - 1) - s * yr + 1,
+                    "Points:1": s * (xr - 1) + c * yr,
+                    "Points:2": z,
+                }
+            )
+        )
+    vortex = pd.concat(vortex, ignore_index=True)
+    yr = -s * (vortex["Points:0"] - 1) + c * vortex["Points:1"]
+    dy, dz = yr - 0.1, vortex["Points:2"] - hwl
+    r2 = dy ** 2 + dz ** 2
+    rc2 = 0.05 ** 2
+    utheta = 0.5 * 46.0 * (1 - np.exp(-r2 / rc2)) / np.sqrt(r2 + 1e-12) * 0.05
+
+    for step in range(nsteps):
+        noise = rng.normal(size=len(wing))
+        pressure = -cp * 0.5 * rho0 * 46.0 ** 2 * (1 + 0.01 * noise)
+        df = wing.copy()
+        df["pressure"] = pressure
+        df["pressure_force_:0"] = 0.0
+        df["pressure_force_:1"] = pressure * 1e-3
+        df["pressure_force_:2"] = 0.0
+        df["tau_wall"] = np.abs(noise)
+        df["velocity_:0"] = 0.0
+        df["velocity_:1"] = 0.0
+        df["velocity_:2"] = 0.0
+        write_shards(df, wdir, step, nranks)
+
+        noise = rng.normal(size=len(vortex))
+        uyr = -utheta * dz / np.sqrt(r2 + 1e-12) + noise
+        uxr = 46.0 * (1 - 0.3 * np.exp(-r2 / rc2)) + noise
+        df = vortex.copy()
+        df["pressure"] = -0.5 * rho0 * utheta ** 2 + noise
+        df["velocity_:0"] = c * uxr - s * uyr
+        df["velocity_:1"] = s * uxr + c * uyr
+        df["velocity_:2"] = utheta * dy / np.sqrt(r2 + 1e-12) + noise
+        write_shards(df, vdir, step, nranks)
+
+
+# ========================================================================
+def run_stage(name, cmd, cwd):
+    """Run a stage in a subprocess and measure its time and memory
+
+    The stage is also asked to record its own timeline of sub-stages
+    (see profiling.py), which is added to the results.
+    """
+    tname = os.path.join(cwd, f"{name}.trace.json")
+    env = dict(os.environ, MCALISTER_PROFILE=tname)
+    start = time.perf_counter()
+    with open(os.path.join(cwd, f"{name}.err"), "w+") as err:
+        proc = subprocess.Popen(
+            cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=err
+        )
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        err.seek(0)
+        msg = err.read().strip()
+    # negative signal number if killed, like subprocess
+    if os.WIFSIGNALED(status):
+        returncode = -os.WTERMSIG(status)
+    else:
+        returncode = os.WEXITSTATUS(status)
+    proc.returncode = returncode
+
+    try:
+        with open(tname, "r") as f:
+            substages = json.load(f)["stages"]
+    except (OSError, ValueError, KeyError):
+        substages = {}
+
+    return {
+        "stage": name,
+        "command": " ".join(cmd),
+        "wall_time": wall,
+        "cpu_time": usage.ru_utime + usage.ru_stime,
+        "max_rss_mb": usage.ru_maxrss / 1024,
+        "returncode": returncode,
+        "error": msg.splitlines()[-1] if returncode and msg else "",
+        "substages": substages,
+    }
+
+
+# ========================================================================
+def get_cold_start(cmd, cwd, repeat=3):
+    """Best wall time of a command started from scratch"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# ========================================================================
+def get_version(srcdir):
+    """Return the git version of the code being benchmarked"""
+    try:
+        return subprocess.check_output(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=srcdir,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Run the post-processing benchmark"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="Benchmark the post-processing on a synthetic case"
+    )
+    parser.add_argument(
+        "-d", "--directory", help="Work directory", type=str, default="benchmark"
+    )
+    parser.add_argument(
+        "--npts",
+        help="Number of points per time step of each slice folder"
+        " (split across the slices and rank shards)",
+        type=int,
+        default=2000,
+    )
+    parser.add_argument("--nsteps", help="Number of time steps", type=int, default=10)
+    parser.add_argument("--nranks", help="Number of rank shards", type=int, default=4)
+    parser.add_argument(
+        "--nforces", help="Number of rows in forces.dat", type=int, default=1000
+    )
+    parser.add_argument(
+        "--stages",
+        help="Stages to run",
+        nargs="+",
+        type=str,
+        default=["avg_wing", "avg_vortex", "plot_wing", "plot_vortex", "plot_forces"],
+    )
+    parser.add_argument(
+        "--cold-start",
+        help="Commands whose start up time (--help) is measured",
+        nargs="*",
+        type=str,
+        default=[
+            "avg_slices",
+            "plot_wing",
+            "plot_vortex",
+            "plot_forces",
+            "probes",
+            "spectral",
+            "manifest",
+            "parse_log",
+            "decomp_stats",
+            "courant_advisor",
+            "rotate_mesh",
+        ],
+    )
+    parser.add_argument(
+        "-o", "--output", help="Results file", type=str, default="benchmark.json"
+    )
+    args = parser.parse_args()
+
+    # Setup the work directory (the plot scripts look for the reference
+    # data in the current directory) and run the commands of this copy
+    # of the mcalister package
+    srcdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        p for p in [srcdir, os.environ.get("PYTHONPATH", "")] if p
+    )
+    wdir = os.path.abspath(args.directory)
+    shutil.rmtree(wdir, ignore_errors=True)
+    os.makedirs(wdir)
+    for name in ["exp_data", "sitaraman_data"]:
+        os.symlink(os.path.join(srcdir, name), os.path.join(wdir, name))
+
+    cdir = os.path.join(wdir, "SST-12")
+    start = time.perf_counter()
+    generate_case(cdir, 12, args.npts, args.nsteps, args.nranks, args.nforces)
+    gen_time = time.perf_counter() - start
+
+    def script(name):
+        return [sys.executable, "-m", f"mcalister.{name}"]
+
+    stages = {
+        "avg_wing": script("avg_slices")
+        + ["-f", os.path.join(cdir, "wing_slices"), "-n", str(args.nsteps)],
+        "avg_vortex": script("avg_slices")
+        + ["-f", os.path.join(cdir, "vortex_slices"), "-n", str(args.nsteps)],
+        "plot_wing": script("plot_wing") + ["-f", cdir],
+        "plot_vortex": script("plot_vortex") + ["-f", cdir],
+        "plot_forces": script("plot_forces") + ["-f", cdir],
+    }
+
+    results = []
+    for name in args.stages:
+        res = run_stage(name, stages[name], wdir)
+        results.append(res)
+        status = "ok" if res["returncode"] == 0 else "FAILED " + res["error"]
+        print(
+            f"{name:12s} {res['wall_time']:8.3f} s {res['max_rss_mb']:8.1f} MB {status}"
+        )
+
+    cold_start = {}
+    for name in args.cold_start:
+        cold_start[name] = get_cold_start(script(name) + ["--help"], wdir)
+        print(f"{name:16s} {cold_start[name]:8.3f} s to start")
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "version": get_version(srcdir),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "host": platform.node(),
+                "parameters": vars(args),
+                "generate_time": gen_time,
+                "stages": results,
+                "cold_start": cold_start,
+            },
+            f,
+            indent=2,
+        )
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
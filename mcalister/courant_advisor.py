@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+#
+# This computes the Courant number distributions of each block from the
+# element_courant output and recommends a time step for a CFL budget
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import re
+import glob
+import argparse
+import numpy as np
+from mcalister import exodus
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_bins(lo=1e-4, hi=1e5, per_decade=50):
+    """Logarithmic bins for the Courant number histograms"""
+    ndec = int(np.round(np.log10(hi / lo)))
+    return np.logspace(np.log10(lo), np.log10(hi), ndec * per_decade + 1)
+
+
+# ========================================================================
+def histogram_rows(data, bins):
+    """Histogram of each row of a 2D array (vectorized)"""
+    nbins = len(bins) + 1
+    idx = np.searchsorted(bins, data)
+    idx += nbins * np.arange(data.shape[0])[:, None]
+    return np.bincount(idx.ravel(), minlength=nbins * data.shape[0]).reshape(
+        data.shape[0], nbins
+    )
+
+
+# ========================================================================
+def get_series(fnames):
+    """Group the output files by series (one per restart segment, in
+    order), dropping the rank suffix (.nprocs.rank) of the names"""
+    series = {}
+    for fname in fnames:
+        key = re.sub(r"\.\d+\.\d+$", "", os.path.basename(fname))
+        series.setdefault(key, []).append(fname)
+    return [series[key] for key in sorted(series)]
+
+
+# ========================================================================
+def get_output_times(series, decimals=10):
+    """Times of all the series and the row of each step of each series
+
+    A time written by several series (after a restart from an earlier
+    time) is taken from the last one: its steps in the earlier series
+    get the row -1.
+    """
+    stimes = []
+    for fnames in series:
+        with exodus.open_exodus(fnames[0]) as f:
+            stimes.append(np.round(exodus.get_times(f), decimals))
+    times = np.unique(np.concatenate(stimes)) if len(stimes) > 0 else np.array([])
+    owner = np.full(len(times), -1)
+    for k, st in enumerate(stimes):
+        owner[np.searchsorted(times, st)] = k
+    rows = []
+    for k, st in enumerate(stimes):
+        row = np.searchsorted(times, st)
+        rows.append(np.where(owner[row] == k, row, -1))
+    return times, rows
+
+
+# ========================================================================
+def accumulate_courant(fnames, bins, chunk=16):
+    """Stream element_courant and velocity over the ranks and steps
+
+    Returns the times, the histograms of the Courant number for each
+    block and step, the max Courant number for each block and step and
+    the max velocity magnitude at each step. The files of the restart
+    segments are matched on their times. Only chunk steps of one block
+    are held in memory at a time.
+    """
+    series = get_series(fnames)
+    times, srows = get_output_times(series)
+    nt = len(times)
+    hists = {}
+    cmax = {}
+    umax = np.zeros(nt)
+    for fnames, rows in zip(series, srows):
+        for fname in fnames:
+            with exodus.open_exodus(fname) as f:
+                nsteps = len(rows)
+                names = exodus.get_names(f, "name_elem_var")
+                for b, block in enumerate(exodus.get_block_names(f)):
+                    if "element_courant" not in names:
+                        break
+                    idx = names.index("element_courant") + 1
+                    vname = f"vals_elem_var{idx}eb{b + 1}"
+                    if vname not in f.variables:
+                        continue
+                    var = f.variables[vname]
+                    block = block.lower()
+                    hist = hists.setdefault(
+                        block, np.zeros((nt, len(bins) + 1), dtype=int)
+                    )
+                    bmax = cmax.setdefault(block, np.zeros(nt))
+                    for start in range(0, nsteps, chunk):
+                        row = rows[start : start + chunk]
+                        keep = row >= 0
+                        if not keep.any():
+                            continue
+                        data = np.asarray(var[start : start + chunk])[keep]
+                        row = row[keep]
+                        hist[row] += histogram_rows(data, bins)
+                        if data.shape[1] > 0:
+                            bmax[row] = np.maximum(bmax[row], data.max(axis=1))
+                        del data
+                    del var
+
+                # velocity magnitude
+                vnames = ["velocity_x", "velocity_y", "velocity_z"]
+                nodvars = exodus.get_names(f, "name_nod_var")
+                if all(n in nodvars for n in vnames[:2]):
+                    for start in range(0, nsteps, chunk):
+                        steps = [
+                            s
+                            for s in range(start, min(start + chunk, nsteps))
+                            if rows[s] >= 0
+                        ]
+                        if len(steps) == 0:
+                            continue
+                        umag2 = 0.0
+                        for n in vnames:
+                            if n in nodvars:
+                                comp = np.array(
+                                    [exodus.get_nodal_variable(f, n, s) for s in steps]
+                                )
+                                umag2 = umag2 + comp ** 2
+                        row = rows[steps]
+                        umax[row] = np.maximum(umax[row], np.sqrt(umag2).max(axis=1))
+    return times, hists, cmax, umax
+
+
+# ========================================================================
+def get_quantile(hist, bins, q):
+    """Quantile (upper bin edge) from histograms, one per row"""
+    hist = np.atleast_2d(hist)
+    cdf = np.cumsum(hist, axis=1)
+    total = cdf[:, -1:]
+    idx = np.argmax(cdf >= q * np.maximum(total, 1), axis=1)
+    edges = np.append(bins, np.inf)
+    return edges[idx]
+
+
+# ========================================================================
+def get_time_step_settings(dt, cfl, cfl_budget, cfl_var):
+    """Recommend a time step and time_step_control settings
+
+    The Courant number scales linearly with the time step. For the
+    implicit solver the cost of a step is roughly independent of the
+    time step so the simulated time per core hour is maximized by the
+    largest time step within the CFL budget.
+    """
+    dt_max = dt * cfl_budget / cfl
+    change = 1.05 if cfl_var < 0.05 else 1.1 if cfl_var < 0.2 else 1.2
+    return {
+        "time_step": float(f"{dt_max:.3g}"),
+        "speedup": dt_max / dt,
+        "time_step_control": {
+            "target_courant": float(cfl_budget),
+            "time_step_change_factor": change,
+        },
+    }
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Report the Courant numbers and recommend a time step"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="Courant number statistics and time step advisor"
+    )
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-p",
+        "--pattern",
+        help="Pattern of the output files",
+        type=str,
+        default="out/*.e*",
+    )
+    parser.add_argument(
+        "-c",
+        "--cfl",
+        help="Courant number budget (e.g. about 1 for the LES region of a DES,"
+        " selected with --blocks and --quantile)",
+        type=float,
+        required=True,
+    )
+    parser.add_argument(
+        "-q",
+        "--quantile",
+        help="Quantile of the Courant number to keep within budget",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "-b", "--blocks", help="Blocks to consider (default all)", nargs="+", type=str
+    )
+    parser.add_argument(
+        "--chunk", help="Number of steps read at a time", type=int, default=16
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import pandas as pd
+    import yaml
+
+    # Setup
+    fdir = os.path.abspath(args.folder)
+    yname = os.path.join(fdir, "mcalister.yaml")
+    fnames = sorted(glob.glob(os.path.join(fdir, args.pattern)))
+    if len(fnames) == 0:
+        raise FileNotFoundError(f"No files matching {args.pattern} in {fdir}")
+    with open(yname, "r") as stream:
+        dat = yaml.safe_load(stream)
+    dt = float(dat["Time_Integrators"][0]["StandardTimeIntegrator"]["time_step"])
+    bins = get_bins()
+
+    with profiling.stage("read", folder=fdir) as info:
+        times, hists, cmax, umax = accumulate_courant(fnames, bins, args.chunk)
+        info["rows"] = len(times)
+    if len(hists) == 0:
+        raise ValueError("No element_courant in the output files")
+    blocks = [b.lower() for b in args.blocks] if args.blocks else sorted(hists)
+
+    # Time history of the distributions of each block
+    lst = []
+    for block in sorted(hists):
+        hist = hists[block]
+        lst.append(
+            pd.DataFrame(
+                {
+                    "block": block,
+                    "time": times,
+                    "elements": hist.sum(axis=1),
+                    "p50": get_quantile(hist, bins, 0.5),
+                    "p99": get_quantile(hist, bins, 0.99),
+                    "p999": get_quantile(hist, bins, 0.999),
+                    "max": cmax[block],
+                    "umax": umax,
+                }
+            )
+        )
+    df = pd.concat(lst, ignore_index=True)
+    df.to_csv(os.path.join(fdir, "courant.csv"), index=False)
+
+    # Overall distributions
+    print(f"Courant numbers for {fdir} (time_step = {dt})")
+    summary = df.groupby("block").agg(
+        p50=("p50", "median"), p99=("p99", "max"), max=("max", "max")
+    )
+    print(summary.to_string(float_format=lambda x: f"{x:.4g}"))
+
+    # Recommendation based on the selected blocks
+    hist = sum(hists[b] for b in blocks)
+    if args.quantile < 1:
+        history = get_quantile(hist, bins, args.quantile)
+    else:
+        history = np.max([cmax[b] for b in blocks], axis=0)
+    cfl = history.max()
+    cfl_var = history.std() / history.mean() if history.mean() > 0 else 0.0
+    settings = get_time_step_settings(dt, cfl, args.cfl, cfl_var)
+    print(
+        f"Courant number ({args.quantile} quantile, blocks {', '.join(blocks)}): "
+        f"{cfl:.4g} (variation over time {cfl_var:.2%})"
+    )
+    print(
+        f"Largest time step for a Courant number of {args.cfl}: "
+        f"{settings['time_step']} ({settings['speedup']:.3g}x simulated time per "
+        "core hour)"
+    )
+    print("Suggested settings:")
+    print(
+        yaml.safe_dump(
+            {
+                "time_step": settings["time_step"],
+                "time_step_control": settings["time_step_control"],
+            },
+            default_flow_style=False,
+        )
+    )
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+#
+# This reports the load balance of the decomposed Exodus files (one per
+# rank): nodes and elements per rank and per block, and the overset
+# fringe and hole nodes from iblank
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import glob
+import argparse
+import numpy as np
+from mcalister import exodus
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_rank_stats(fname, step=-1):
+    """Sizes of a single rank file"""
+    with exodus.open_exodus(fname) as f:
+        stats = {
+            "file": os.path.basename(fname),
+            "nodes": exodus.get_dimension(f, "num_nodes"),
+        }
+        nelems = 0
+        for name, (nel, _) in zip(exodus.get_block_names(f), exodus.get_block_sizes(f)):
+            stats[f"elements:{name.lower()}"] = nel
+            nelems += nel
+        stats["elements"] = nelems
+
+        # Overset status of the nodes (1: field, 0: hole, -1: fringe)
+        iblank = None
+        if len(exodus.get_times(f)) > 0:
+            iblank = exodus.get_nodal_variable(f, "iblank", step)
+        if iblank is not None:
+            iblank = np.rint(iblank)
+            stats["field"] = int(np.count_nonzero(iblank == 1))
+            stats["hole"] = int(np.count_nonzero(iblank == 0))
+            stats["fringe"] = int(np.count_nonzero(iblank == -1))
+            del iblank
+    return stats
+
+
+# ========================================================================
+def get_imbalance(df):
+    """Max over mean ratio of each (numeric) column"""
+    import pandas as pd
+
+    cols = [c for c in df.columns if c != "file"]
+    mean = df[cols].mean()
+    return pd.DataFrame(
+        {
+            "min": df[cols].min(),
+            "mean": mean,
+            "max": df[cols].max(),
+            "imbalance": df[cols].max() / mean.where(mean > 0),
+        }
+    )
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Report the load balance of a decomposed output"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="Load balance of a decomposed Exodus output"
+    )
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-p", "--pattern", help="Pattern of the rank files", type=str, default="*.e.*"
+    )
+    parser.add_argument(
+        "-s", "--step", help="Output step for iblank", type=int, default=-1
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import pandas as pd
+
+    # Setup
+    fdir = os.path.abspath(args.folder)
+    fnames = sorted(glob.glob(os.path.join(fdir, args.pattern)))
+    if len(fnames) == 0:
+        raise FileNotFoundError(f"No files matching {args.pattern} in {fdir}")
+
+    with profiling.stage("read", folder=fdir) as info:
+        df = pd.DataFrame([get_rank_stats(fname, args.step) for fname in fnames])
+        df = df.fillna(0)
+        info["rows"] = len(df)
+    df.to_csv(os.path.join(fdir, "decomposition.csv"), index=False)
+
+    # Report
+    print(f"{len(df)} ranks in {fdir}")
+    print(get_imbalance(df).to_string(float_format=lambda x: f"{x:.4g}"))
+    if "field" in df.columns:
+        active = df.field + df.fringe
+        print(f"field + fringe nodes imbalance: {active.max() / active.mean():.4g}")
+        print(
+            f"total fringe/field ratio: {df.fringe.sum() / max(df.field.sum(), 1):.4g}"
+        )
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
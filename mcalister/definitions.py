@@ -1,3 +1,4 @@
+import os
 import re
 
 
@@ -72,3 +73,18 @@ def get_wing_slices(dim):
 def get_vortex_slices():
     """Return the vortex slices"""
     return [0.1, 0.2, 0.5, 1.0, 2.0, 4.0, 6.0]
+
+
+# ========================================================================
+def get_data_dir(name):
+    """Return a reference data folder (exp_data, sitaraman_data)
+
+    The folder is looked up in MCALISTER_DATA, in the working directory
+    and next to the mcalister package, in that order.
+    """
+    dirs = [os.environ.get("MCALISTER_DATA", ""), os.getcwd()]
+    dirs.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for ddir in dirs:
+        if ddir and os.path.isdir(os.path.join(ddir, name)):
+            return os.path.abspath(os.path.join(ddir, name))
+    return os.path.abspath(name)
@@ -0,0 +1,164 @@
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import numpy as np
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def open_exodus(fname, mode="r"):
+    """Open an Exodus file (memory-mapped)
+
+    Exodus files are NetCDF files. Only the classic and 64-bit offset
+    formats can be read this way: files in the NetCDF-4 format need to
+    be converted first (e.g. nccopy -k 64-bit-offset in.e out.e).
+    """
+    from scipy.io import netcdf_file
+
+    try:
+        return netcdf_file(fname, mode, mmap=(mode == "r"))
+    except TypeError as exc:
+        raise TypeError(
+            f"{fname} is not a classic NetCDF file (convert it with nccopy -k 2)"
+        ) from exc
+
+
+# ========================================================================
+def get_variable_layout(fname):
+    """File offset, dtype and shape of the (non record) variables
+
+    The offsets are read from the header of the classic or 64-bit
+    offset NetCDF file (see the NetCDF file format specification).
+    """
+    types = {1: "i1", 2: "S1", 3: "i2", 4: "i4", 5: "f4", 6: "f8"}
+    sizes = {1: 1, 2: 1, 3: 2, 4: 4, 5: 4, 6: 8}
+
+    with open(fname, "rb") as f:
+        magic = f.read(4)
+        if magic[:3] != b"CDF" or magic[3] not in (1, 2):
+            raise TypeError(f"{fname} is not a classic NetCDF file")
+        offset_size = 4 if magic[3] == 1 else 8
+
+        def read_int(size=4):
+            return int.from_bytes(f.read(size), "big")
+
+        def read_name():
+            n = read_int()
+            name = f.read(n).decode()
+            f.read(-n % 4)
+            return name
+
+        def skip_attributes():
+            read_int()
+            for _ in range(read_int()):
+                read_name()
+                nc_type, n = read_int(), read_int()
+                f.read(n * sizes[nc_type] + (-n * sizes[nc_type]) % 4)
+
+        read_int()
+        read_int()
+        dims = []
+        for _ in range(read_int()):
+            read_name()
+            dims.append(read_int())
+        skip_attributes()
+
+        layout = {}
+        read_int()
+        for _ in range(read_int()):
+            name = read_name()
+            shape = tuple(dims[read_int()] for _ in range(read_int()))
+            skip_attributes()
+            nc_type = read_int()
+            read_int()
+            begin = read_int(offset_size)
+            if 0 not in shape[:1]:
+                layout[name] = (begin, np.dtype(">" + types[nc_type]), shape)
+    return layout
+
+
+# ========================================================================
+def get_names(f, name):
+    """Decode a NetCDF character array of names"""
+    if name not in f.variables:
+        return []
+    return [
+        b"".join(row).decode(errors="replace").strip("\x00 ")
+        for row in f.variables[name][:]
+    ]
+
+
+# ========================================================================
+def get_dimension(f, name, default=0):
+    """Size of a NetCDF dimension"""
+    val = f.dimensions.get(name, default)
+    return default if val is None else int(val)
+
+
+# ========================================================================
+def get_block_names(f):
+    """Names of the element blocks (in block order)"""
+    nblk = get_dimension(f, "num_el_blk")
+    names = get_names(f, "eb_names")
+    return [
+        names[i] if i < len(names) and names[i] else f"block_{i + 1}"
+        for i in range(nblk)
+    ]
+
+
+# ========================================================================
+def get_block_sizes(f):
+    """Number of elements and nodes per element of each block"""
+    return [
+        (
+            get_dimension(f, f"num_el_in_blk{i + 1}"),
+            get_dimension(f, f"num_nod_per_el{i + 1}"),
+        )
+        for i in range(get_dimension(f, "num_el_blk"))
+    ]
+
+
+# ========================================================================
+def get_times(f):
+    """Times of the output steps"""
+    if "time_whole" not in f.variables:
+        return np.array([])
+    return np.array(f.variables["time_whole"][:], dtype=np.float64)
+
+
+# ========================================================================
+def get_coordinates(f):
+    """Nodal coordinates as a (num_nodes, num_dim) view"""
+    if "coord" in f.variables:
+        return f.variables["coord"][:].T
+    names = [n for n in ["coordx", "coordy", "coordz"] if n in f.variables]
+    return np.column_stack([f.variables[n][:] for n in names])
+
+
+# ========================================================================
+def get_nodal_variable(f, name, step=-1):
+    """Values of a nodal variable at an output step (None if missing)"""
+    names = get_names(f, "name_nod_var")
+    if name not in names:
+        return None
+    idx = names.index(name)
+    if "vals_nod_var" in f.variables:
+        return f.variables["vals_nod_var"][step, idx, :]
+    return f.variables[f"vals_nod_var{idx + 1}"][step, :]
+
+
+# ========================================================================
+def get_element_variable(f, name, block, step=-1):
+    """Values of an element variable on a block (index) at an output step"""
+    names = get_names(f, "name_elem_var")
+    if name not in names:
+        return None
+    vname = f"vals_elem_var{names.index(name) + 1}eb{block + 1}"
+    if vname not in f.variables:
+        return None
+    return f.variables[vname][step, :]
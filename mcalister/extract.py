@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+#
+# This runs the ParaView extraction scripts (pp_wing.py, pp_vortex.py)
+# with pvpython so that they can be called like the other commands
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import sys
+import shutil
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_pvpython():
+    """Path to pvpython (PVPYTHON or on the PATH)"""
+    pvpython = os.environ.get("PVPYTHON") or shutil.which("pvpython")
+    if pvpython is None:
+        raise FileNotFoundError("pvpython not found (add it to PATH or set PVPYTHON)")
+    return pvpython
+
+
+# ========================================================================
+def run(script, argv=None):
+    """Replace the current process by pvpython running a script"""
+    argv = sys.argv[1:] if argv is None else argv
+    sdir = os.path.dirname(os.path.abspath(__file__))
+    pvpython = get_pvpython()
+    env = dict(os.environ)
+    # the scripts import the mcalister package
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [os.path.dirname(sdir), env.get("PYTHONPATH", "")] if p
+    )
+    os.execve(pvpython, [pvpython, os.path.join(sdir, script)] + argv, env)
+
+
+# ========================================================================
+def wing():
+    """Extract the wing slices"""
+    run("pp_wing.py")
+
+
+# ========================================================================
+def vortex():
+    """Extract the vortex slices"""
+    run("pp_vortex.py")
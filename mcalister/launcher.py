@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+#
+# This runs many cases concurrently in a single allocation. The cost of
+# each case is estimated from the mesh size and the number of steps in
+# its input file, the cases are packed on a budget of cores (largest
+# first, smaller cases backfill the free cores) and each one is bound
+# to its own cores. The achieved core utilization is reported.
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import sys
+import json
+import time
+import shlex
+import shutil
+import argparse
+import subprocess
+import numpy as np
+from mcalister import exodus
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_num_elements(mname):
+    """Number of elements of an Exodus mesh (None if it cannot be read)"""
+    try:
+        with exodus.open_exodus(mname) as f:
+            return exodus.get_dimension(f, "num_elem")
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+# ========================================================================
+def get_case(fdir, iname="mcalister.yaml"):
+    """Mesh size and number of steps of a case from its input file"""
+    import yaml
+
+    fdir = os.path.abspath(fdir)
+    with open(os.path.join(fdir, iname), "r") as stream:
+        dat = yaml.safe_load(stream)
+    ti = dat["Time_Integrators"][0]["StandardTimeIntegrator"]
+    if "termination_step_count" in ti:
+        nsteps = int(ti["termination_step_count"])
+    else:
+        nsteps = int(
+            np.ceil(
+                (float(ti["termination_time"]) - float(ti["start_time"]))
+                / float(ti["time_step"])
+            )
+        )
+    mname = os.path.join(fdir, dat["realms"][0]["mesh"])
+    return {
+        "folder": fdir,
+        "input": iname,
+        "mesh": mname,
+        "elements": get_num_elements(mname),
+        "steps": nsteps,
+    }
+
+
+# ========================================================================
+def estimate_costs(cases, budget, elements_per_core, rate):
+    """Cores and estimated run time (seconds) of each case
+
+    Cases whose mesh could not be read get the median size of the
+    others (or one element). The cores follow from the elements per
+    core, the run time from the element updates per core per second.
+    """
+    known = [case["elements"] for case in cases if case["elements"] is not None]
+    default = float(np.median(known)) if len(known) > 0 else 1.0
+    for case in cases:
+        nelem = case["elements"] if case["elements"] is not None else default
+        case["cost"] = nelem * case["steps"]
+        case["cores"] = int(np.clip(np.ceil(nelem / elements_per_core), 1, budget))
+        case["estimate"] = case["cost"] / (case["cores"] * rate)
+    return cases
+
+
+# ========================================================================
+def pick_next(queue, nfree):
+    """Case of the queue (sorted by decreasing cost) to start next
+
+    The most expensive case that fits in the free cores is started so
+    that smaller cases backfill the cores the large ones leave free.
+    """
+    for case in queue:
+        if case["cores"] <= nfree:
+            return case
+    return None
+
+
+# ========================================================================
+def simulate(cases, budget):
+    """Schedule of the cases with their estimated run times
+
+    Returns the start time of each case and the makespan.
+    """
+    queue = sorted(cases, key=lambda case: -case["cost"])
+    running = []
+    starts = {}
+    now, nfree = 0.0, budget
+    while len(queue) > 0 or len(running) > 0:
+        case = pick_next(queue, nfree)
+        if case is not None:
+            queue.remove(case)
+            starts[case["folder"]] = now
+            running.append((now + case["estimate"], case))
+            nfree -= case["cores"]
+            continue
+        running.sort(key=lambda run: run[0])
+        now, done = running.pop(0)
+        nfree += done["cores"]
+    return starts, now
+
+
+# ========================================================================
+def get_command(case, cpus, executable, launch, stand_in=None):
+    """Command line of a case
+
+    launch is a template (e.g. srun options) with the {ranks} and
+    {cpus} fields. With stand_in, the solver is replaced by a sleep of
+    the estimated run time scaled by stand_in.
+    """
+    if stand_in is not None:
+        seconds = case["estimate"] * stand_in
+        solver = [sys.executable, "-c", f"import time; time.sleep({seconds})"]
+    else:
+        solver = shlex.split(executable) + ["-i", case["input"], "-o", "mcalister.o"]
+    prefix = launch.format(ranks=case["cores"], cpus=",".join(map(str, cpus)))
+    return shlex.split(prefix) + solver
+
+
+# ========================================================================
+def start(case, cmd, cpus=None):
+    """Start a case (bound to cpus if given)"""
+    env = dict(os.environ)
+    env["OMP_NUM_THREADS"] = "1"
+    env["OMP_PLACES"] = "threads"
+    env["OMP_PROC_BIND"] = "spread"
+
+    def bind():
+        if cpus is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+
+    log = open(os.path.join(case["folder"], "launcher.out"), "w")
+    proc = subprocess.Popen(
+        cmd,
+        cwd=case["folder"],
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        preexec_fn=bind,
+    )
+    log.close()
+    return proc
+
+
+# ========================================================================
+def get_record(case, cpus, tstart, tend, returncode):
+    """Report entry of a case"""
+    return {
+        "folder": case["folder"],
+        "cores": case["cores"],
+        "cpus": cpus,
+        "estimate": case["estimate"],
+        "start": tstart,
+        "end": tend,
+        "returncode": returncode,
+    }
+
+
+# ========================================================================
+def run(cases, budget, cpus, executable, launch, stand_in=None, poll=0.1):
+    """Run the cases, starting queued cases as cores become free
+
+    Returns the start and end times, cpus and return code of each case.
+    """
+    queue = sorted(cases, key=lambda case: -case["cost"])
+    free = list(cpus[:budget])
+    running = {}
+    records = []
+    t0 = time.time()
+    while len(queue) > 0 or len(running) > 0:
+        case = pick_next(queue, len(free))
+        if case is not None:
+            queue.remove(case)
+            free.sort()
+            mine, free = free[: case["cores"]], free[case["cores"] :]
+            cmd = get_command(case, mine, executable, launch, stand_in)
+            tstart = time.time() - t0
+            try:
+                with profiling.stage("start", folder=case["folder"]):
+                    # the launcher does the binding if there is one
+                    proc = start(case, cmd, mine if len(launch) == 0 else None)
+            except OSError as exc:
+                print(f"Could not start {case['folder']}: {exc}", file=sys.stderr)
+                free += mine
+                records.append(get_record(case, mine, tstart, tstart, 127))
+                continue
+            running[proc] = (case, mine, tstart)
+            print(f"Started {case['folder']} on cpus {mine}")
+            continue
+
+        time.sleep(poll)
+        for proc in [proc for proc in running if proc.poll() is not None]:
+            case, mine, tstart = running.pop(proc)
+            free += mine
+            records.append(
+                get_record(case, mine, tstart, time.time() - t0, proc.returncode)
+            )
+            print(f"Finished {case['folder']} (return code {proc.returncode})")
+    return records
+
+
+# ========================================================================
+def get_utilization(records, budget):
+    """Busy core-seconds over the core-seconds of the allocation"""
+    if len(records) == 0:
+        return 0.0, 0.0
+    makespan = max(r["end"] for r in records) - min(r["start"] for r in records)
+    busy = sum(r["cores"] * (r["end"] - r["start"]) for r in records)
+    return makespan, busy / (budget * makespan) if makespan > 0 else 0.0
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Run many cases concurrently on a budget of cores"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="Pack and run many cases in a single allocation"
+    )
+    parser.add_argument(
+        "-f", "--folders", nargs="+", help="Case folders", type=str, required=True
+    )
+    parser.add_argument(
+        "-n",
+        "--cores",
+        help="Core budget (default: available cpus)",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-e", "--executable", help="Solver executable", type=str, default="naluX"
+    )
+    parser.add_argument(
+        "-l",
+        "--launch",
+        help="Launcher template with {ranks} and {cpus} fields (default: srun"
+        " or mpiexec, whichever is available)",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "--elements-per-core",
+        help="Mesh elements per core",
+        type=float,
+        default=50000,
+    )
+    parser.add_argument(
+        "--rate",
+        help="Element updates per core per second for the run time estimates",
+        type=float,
+        default=1e4,
+    )
+    parser.add_argument(
+        "--stand-in",
+        help="Replace the solver by a sleep of the estimated run time times this",
+        type=float,
+        default=None,
+    )
+    parser.add_argument(
+        "--dry-run", help="Only print the estimated schedule", action="store_true"
+    )
+    parser.add_argument(
+        "-o", "--output", help="Report file", type=str, default="launcher.json"
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import pandas as pd
+
+    # Setup
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count()))
+    budget = args.cores if args.cores is not None else len(cpus)
+    if budget > len(cpus):
+        # oversubscribe rather than bind to cpus that do not exist
+        cpus = [cpus[i % len(cpus)] for i in range(budget)]
+    launch = args.launch
+    if launch is None and args.stand_in is None:
+        if shutil.which("srun"):
+            launch = "srun --exact -n {ranks} -c 1 --cpu-bind=cores"
+        elif shutil.which("mpiexec"):
+            launch = "mpiexec -n {ranks} --cpu-set {cpus} --bind-to core"
+    if launch is None:
+        # the stand-in is bound to its cpus directly
+        launch = ""
+
+    # Estimate the costs
+    with profiling.stage("estimate"):
+        cases = [get_case(folder) for folder in args.folders]
+        estimate_costs(cases, budget, args.elements_per_core, args.rate)
+    for case in cases:
+        if case["elements"] is None:
+            print(f"Cannot read {case['mesh']}: size estimated", file=sys.stderr)
+    starts, makespan = simulate(cases, budget)
+    df = pd.DataFrame(cases)[["folder", "elements", "steps", "cores", "estimate"]]
+    df["start"] = [starts[case["folder"]] for case in cases]
+    busy = sum(case["cores"] * case["estimate"] for case in cases)
+    print(f"Estimated schedule on {budget} cores")
+    print(df.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+    print(
+        f"Estimated makespan {makespan:.4g} s,"
+        f" utilization {busy / (budget * makespan) if makespan > 0 else 0:.1%}"
+    )
+    if args.dry_run:
+        return
+    if len(launch) == 0 and args.stand_in is None:
+        multi = [case["folder"] for case in cases if case["cores"] > 1]
+        if len(multi) > 0:
+            parser.error(
+                f"no MPI launcher (srun or mpiexec) to run {' '.join(multi)}"
+                " on more than one core, give one with --launch"
+            )
+
+    # Run
+    with profiling.stage("run"):
+        records = run(cases, budget, cpus, args.executable, launch, args.stand_in)
+    makespan, utilization = get_utilization(records, budget)
+    df = pd.DataFrame(records)
+    print(df.drop(columns=["cpus"]).to_string(index=False, float_format="%.4g"))
+    print(f"Makespan {makespan:.4g} s, utilization {utilization:.1%}")
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "budget": budget,
+                "makespan": makespan,
+                "utilization": utilization,
+                "cases": records,
+            },
+            f,
+            indent=2,
+        )
+    failed = [r["folder"] for r in records if r["returncode"] != 0]
+    if len(failed) > 0:
+        print(f"Failed: {' '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
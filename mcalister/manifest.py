@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+#
+# This builds (and caches) an index of the time steps in a folder of
+# slice files so that readers do not have to glob over every shard
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import re
+import sys
+import json
+import argparse
+from mcalister import profiling
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_output_times(yname):
+    """Return the start time and the time between two Exodus outputs"""
+    import yaml
+
+    with open(yname, "r") as stream:
+        dat = yaml.safe_load(stream)
+    ti = dat["Time_Integrators"][0]["StandardTimeIntegrator"]
+    freq = dat["realms"][0]["output"]["output_frequency"]
+    return float(ti["start_time"]), float(ti["time_step"]) * freq
+
+
+# ========================================================================
+def build_manifest(fdir, prefix="output", suffix=".csv"):
+    """Scan a folder once and index the shard files by time step
+
+    Physical times are reconstructed from the output frequency and time
+    step in the input file. Steps without the shards of every rank are
+    dropped with a warning. Restarts need no special treatment: the
+    extraction reads all the Exodus restart segments at once and
+    rewrites the whole folder. Compressed shards (.gz, .zst) are indexed
+    too.
+    """
+    fdir = os.path.abspath(fdir)
+    cdir = os.path.dirname(fdir)
+    yname = os.path.join(cdir, "mcalister.yaml")
+    try:
+        t0, dt = get_output_times(yname)
+    except (OSError, KeyError, IndexError, TypeError):
+        t0, dt = 0.0, 1.0
+
+    regex = re.compile(
+        re.escape(prefix) + r"(.*)\.(\d+)" + re.escape(suffix) + r"(\.gz|\.zst)?$"
+    )
+    steps = {}
+    with os.scandir(fdir) as it:
+        for entry in it:
+            match = regex.match(entry.name)
+            if match is None:
+                continue
+            stat = entry.stat()
+            step = steps.setdefault(
+                int(match.group(2)),
+                {"shards": [], "blocks": set(), "size": 0, "mtime": 0.0},
+            )
+            step["shards"].append(entry.name)
+            step["blocks"].add(match.group(1))
+            step["size"] += stat.st_size
+            step["mtime"] = max(step["mtime"], stat.st_mtime)
+
+    # Every step should have the shards of the same ranks
+    counts = {}
+    for step in steps.values():
+        key = tuple(sorted(step["blocks"]))
+        counts[key] = counts.get(key, 0) + 1
+    blocks = set(max(counts, key=counts.get)) if len(counts) > 0 else set()
+
+    entries = []
+    dropped = []
+    for index in sorted(steps):
+        step = steps[index]
+        time = t0 + index * dt
+        if step["blocks"] != blocks:
+            dropped.append(
+                {
+                    "index": index,
+                    "reason": f"shards of {len(step['blocks'])} of {len(blocks)}"
+                    " ranks",
+                }
+            )
+            continue
+        entry = {
+            "index": index,
+            "time": time,
+            "shards": sorted(step["shards"]),
+            "size": step["size"],
+            "mtime": step["mtime"],
+        }
+        entries.append(entry)
+
+    for drop in dropped:
+        print(
+            f"Warning: dropping step {drop['index']} of {fdir} ({drop['reason']})",
+            file=sys.stderr,
+        )
+
+    return {
+        "folder": fdir,
+        "prefix": prefix,
+        "suffix": suffix,
+        "dir_mtime_ns": os.stat(fdir).st_mtime_ns,
+        "steps": entries,
+        "dropped": dropped,
+    }
+
+
+# ========================================================================
+def get_manifest_file(fdir):
+    """Manifest file of a folder (next to it so that writing it does not
+    change the folder)"""
+    return os.path.abspath(fdir) + ".manifest.json"
+
+
+# ========================================================================
+def get_manifest(fdir, prefix="output", suffix=".csv", rebuild=False):
+    """Load the manifest of a folder, building it if missing or stale"""
+    fdir = os.path.abspath(fdir)
+    mname = get_manifest_file(fdir)
+    if not rebuild:
+        try:
+            with open(mname, "r") as f:
+                manifest = json.load(f)
+            if (
+                manifest["dir_mtime_ns"] == os.stat(fdir).st_mtime_ns
+                and manifest["prefix"] == prefix
+                and manifest["suffix"] == suffix
+            ):
+                return manifest
+        except (OSError, ValueError, KeyError):
+            pass
+
+    manifest = build_manifest(fdir, prefix, suffix)
+    with open(mname, "w") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+# ========================================================================
+def get_step_files(manifest, navg=None):
+    """Return the (time index, shard paths) of the last navg steps"""
+    steps = manifest["steps"]
+    if navg is not None:
+        steps = steps[-navg:]
+    return [
+        (s["index"], [os.path.join(manifest["folder"], f) for f in s["shards"]])
+        for s in steps
+    ]
+
+
+# ========================================================================
+def compress_steps(manifest, method="gzip", level=None):
+    """Compress the uncompressed shards of the indexed steps"""
+    from mcalister import utilities
+
+    suffixes = tuple(utilities.get_compression_suffixes().values())
+    for _, fnames in get_step_files(manifest):
+        for fname in fnames:
+            if not fname.endswith(suffixes):
+                utilities.compress_file(fname, method, level)
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Index the time steps of a folder"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Index the time steps of a folder")
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-r", "--rebuild", help="Force a rebuild of the index", action="store_true"
+    )
+    parser.add_argument(
+        "-c",
+        "--compress",
+        help="Compress the shards",
+        type=str,
+        choices=["gzip", "zstd"],
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    with profiling.stage("manifest", folder=args.folder):
+        manifest = get_manifest(args.folder, rebuild=args.rebuild)
+    if args.compress is not None:
+        with profiling.stage("compress", folder=args.folder):
+            compress_steps(manifest, args.compress)
+            manifest = get_manifest(args.folder)
+    steps = manifest["steps"]
+    size = sum(s["size"] for s in steps)
+    print(f"{len(steps)} time steps, {size / 1024 ** 2:.1f} MB")
+    if len(steps) > 0:
+        print(f"time indices {steps[0]['index']} to {steps[-1]['index']}")
+        print(f"times {steps[0]['time']} to {steps[-1]['time']}")
+    if len(manifest.get("dropped", [])) > 0:
+        print(f"{len(manifest['dropped'])} dropped steps")
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
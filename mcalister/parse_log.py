@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+#
+# This extracts the solver statistics (wall time per step, nonlinear and
+# linear iterations, residuals, timers) from a Nalu-Wind log file
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import re
+import argparse
+import numpy as np
+from mcalister import utilities
+from mcalister import profiling
+
+# ========================================================================
+#
+# Some defaults variables
+#
+# ========================================================================
+num = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|nan|inf)"
+step_re = re.compile(r"Time Step Count:\s*(\d+)\s+Current Time:\s*" + num)
+courant_re = re.compile(r"Max Courant:\s*" + num)
+nonlinear_re = re.compile(r"Realm Nonlinear Iteration:\s*(\d+)/(\d+)")
+linsys_re = re.compile(
+    r"^\s*([A-Za-z][\w\-/]*)\s+(\d+)\s+" + num + r"\s+" + num + r"\s+" + num + r"\s*$"
+)
+wall_re = re.compile(
+    r"WallClockTime:\s*(\d+)"
+    + r"(?:\s+Pre:\s*"
+    + num
+    + r"\s+Sol:\s*"
+    + num
+    + r"\s+Post:\s*"
+    + num
+    + ")?"
+)
+timing_re = re.compile(r"Timing for (?:Eq:\s*)?([^:]+?)\s*(?::|$)")
+nprocs_re = re.compile(r"nprocs\s*=\s*(\d+)")
+timer_re = re.compile(
+    r"^\s*(.*?)\s*--\s*avg:\s*" + num + r"\s*min:\s*" + num + r"\s*max:\s*" + num
+)
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def parse_log(fname):
+    """Parse a Nalu-Wind log in a single streaming pass
+
+    Returns a dataframe of per step quantities, a dataframe of the
+    linear solves (one row per equation and nonlinear iteration), the
+    timer tables printed at the end of the run and the number of
+    processes (if printed).
+    """
+    import pandas as pd
+
+    steps = []
+    solves = []
+    timers = []
+    nprocs = None
+    step = None
+    nonlinear = 0
+    table = None
+
+    with open(fname, "r", errors="replace") as f:
+        for line in f:
+
+            # cheap filters before trying the regular expressions
+            if "Time Step Count:" in line:
+                match = step_re.search(line)
+                if match is not None:
+                    step = {
+                        "step": int(match.group(1)),
+                        "time": float(match.group(2)),
+                        "courant": np.nan,
+                        "nonlinear_iters": 0,
+                        "linear_iters": 0,
+                        "pre": np.nan,
+                        "sol": np.nan,
+                        "post": np.nan,
+                    }
+                    steps.append(step)
+                    nonlinear = 0
+                    table = None
+
+            elif step is not None and "Max Courant:" in line:
+                match = courant_re.search(line)
+                if match is not None:
+                    step["courant"] = float(match.group(1))
+
+            elif "Realm Nonlinear Iteration:" in line:
+                match = nonlinear_re.search(line)
+                if match is not None:
+                    nonlinear = int(match.group(1))
+                    if step is not None:
+                        step["nonlinear_iters"] = max(
+                            step["nonlinear_iters"], nonlinear
+                        )
+
+            elif "WallClockTime:" in line:
+                match = wall_re.search(line)
+                # the first field is the step counter, the timings of the
+                # step (seconds) follow
+                if match is not None and step is not None:
+                    if match.group(2) is not None:
+                        step["pre"] = float(match.group(2))
+                        step["sol"] = float(match.group(3))
+                        step["post"] = float(match.group(4))
+
+            elif "Timing for" in line:
+                # the equation name of the tables of the equations
+                # (Timing for Eq: MomentumEQS)
+                match = timing_re.search(line)
+                if match is None:
+                    continue
+                table, rest = match.group(1), line[match.end() :]
+                match = nprocs_re.search(rest)
+                if match is not None:
+                    nprocs = int(match.group(1))
+                match = timer_re.search(rest)
+                if match is not None:
+                    timers.append(timer_row(table, match))
+
+            elif table is not None and "--" in line:
+                match = timer_re.search(line)
+                if match is not None:
+                    timers.append(timer_row(table, match))
+
+            elif step is not None:
+                match = linsys_re.match(line)
+                if match is not None:
+                    iters = int(match.group(2))
+                    step["linear_iters"] += iters
+                    solves.append(
+                        (
+                            step["step"],
+                            nonlinear,
+                            match.group(1),
+                            iters,
+                            float(match.group(3)),
+                            float(match.group(4)),
+                            float(match.group(5)),
+                        )
+                    )
+
+    steps = pd.DataFrame(steps)
+    if len(steps) > 0:
+        steps["wall_time"] = steps.pre + steps.sol + steps.post
+    solves = pd.DataFrame(
+        solves,
+        columns=[
+            "step",
+            "nonlinear_iter",
+            "equation",
+            "linear_iters",
+            "linear_residual",
+            "nonlinear_residual",
+            "scaled_residual",
+        ],
+    )
+    timers = pd.DataFrame(timers, columns=["table", "timer", "avg", "min", "max"])
+    return steps, solves, timers, nprocs
+
+
+# ========================================================================
+def timer_row(table, match):
+    """Row of the timer dataframe"""
+    return [
+        table,
+        match.group(1),
+        float(match.group(2)),
+        float(match.group(3)),
+        float(match.group(4)),
+    ]
+
+
+# ========================================================================
+def get_outliers(values, threshold=5.0):
+    """Indices of outliers based on the median absolute deviation"""
+    values = np.asarray(values, dtype=float)
+    med = np.nanmedian(values)
+    mad = 1.4826 * np.nanmedian(np.fabs(values - med))
+    if not mad > 0:
+        return np.array([], dtype=int)
+    return np.flatnonzero((values - med) / mad > threshold)
+
+
+# ========================================================================
+def get_throughput(steps, nprocs, tconv):
+    """Steps per hour and core hours per convective time (of the steps
+    with timings)"""
+    steps = steps[steps.wall_time.notna()]
+    if len(steps) == 0:
+        return {"steps": 0}
+    wall = steps.wall_time.sum()
+    simulated = steps.time.iloc[-1] - steps.time.iloc[0] + steps.time.diff().median()
+    res = {
+        "steps": len(steps),
+        "wall_hours": wall / 3600,
+        "steps_per_hour": len(steps) / wall * 3600,
+        "simulated_time": simulated,
+        "convective_times": simulated / tconv,
+    }
+    if nprocs is not None:
+        res["core_hours"] = nprocs * wall / 3600
+        res["core_hours_per_convective_time"] = res["core_hours"] / (simulated / tconv)
+    return res
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Report the solver statistics of a log file"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Solver statistics from a log file")
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-l", "--log", help="Log file name", type=str, default="mcalister.o"
+    )
+    parser.add_argument(
+        "-n", "--nprocs", help="Number of processes (if not in the log)", type=int
+    )
+    parser.add_argument(
+        "-t", "--threshold", help="Outlier threshold (MADs)", type=float, default=5.0
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    # Setup
+    fdir = os.path.abspath(args.folder)
+    yname = os.path.join(fdir, "mcalister.yaml")
+    chord = 1
+
+    with profiling.stage("parse", folder=fdir) as info:
+        steps, solves, timers, nprocs = parse_log(os.path.join(fdir, args.log))
+        info["rows"] = len(steps)
+    if args.nprocs is not None:
+        nprocs = args.nprocs
+    if len(steps) == 0:
+        raise ValueError(f"No time steps found in {args.log}")
+
+    # Output the statistics
+    steps.to_csv(os.path.join(fdir, "log_steps.csv"), index=False)
+    solves.to_csv(os.path.join(fdir, "log_solves.csv"), index=False)
+    timers.to_csv(os.path.join(fdir, "log_timers.csv"), index=False)
+
+    # Throughput
+    u0, v0, w0, umag0, rho0, mu = utilities.parse_ic(yname)
+    tconv = chord / umag0
+    throughput = get_throughput(steps, nprocs, tconv)
+    print(f"Throughput for {fdir}")
+    for key, val in throughput.items():
+        print(f"  {key:32s} {val:.6g}")
+
+    # Linear solvers
+    print("Linear solves per equation")
+    print(
+        solves.groupby("equation")
+        .agg(
+            solves=("linear_iters", "size"),
+            mean_iters=("linear_iters", "mean"),
+            max_iters=("linear_iters", "max"),
+            mean_residual=("linear_residual", "mean"),
+            max_residual=("linear_residual", "max"),
+        )
+        .to_string()
+    )
+
+    # Timers
+    if len(timers) > 0:
+        print("Timers (max over ranks)")
+        print(timers.sort_values(by="max", ascending=False).head(20).to_string())
+
+    # Outliers
+    for name in ["wall_time", "linear_iters", "courant"]:
+        idx = get_outliers(steps[name], args.threshold)
+        if len(idx) > 0:
+            print(f"Outliers in {name}")
+            print(steps.iloc[idx][["step", "time", name]].to_string(index=False))
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
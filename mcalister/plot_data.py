@@ -0,0 +1,76 @@
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import json
+import hashlib
+import numpy as np
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_file_hash(fname, blocksize=2 ** 20):
+    """Hash of the content of a file"""
+    sha = hashlib.sha1()
+    with open(fname, "rb") as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+# ========================================================================
+def get_signature(fnames, **params):
+    """Hash of the inputs of a figure (files and parameters)
+
+    Files are identified by the hash of their content, so that copies
+    keeping the modification times or edits within the same time stamp
+    are detected. Missing files are part of the signature too so that
+    the cache is refreshed when a reference data file is added.
+    """
+    sha = hashlib.sha1()
+    for fname in fnames:
+        if os.path.exists(fname):
+            sha.update(f"{fname}:{get_file_hash(fname)}\n".encode())
+        else:
+            sha.update(f"{fname}:missing\n".encode())
+    sha.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return sha.hexdigest()
+
+
+# ========================================================================
+def load(cname, signature):
+    """Cached plot data (dictionary of arrays), None if out of date"""
+    try:
+        with np.load(cname, allow_pickle=False) as dat:
+            if str(dat["signature"]) == signature:
+                return {key: dat[key] for key in dat.files if key != "signature"}
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+# ========================================================================
+def save(cname, signature, data):
+    """Cache plot data (dictionary of arrays)"""
+    np.savez(cname, signature=np.array(signature), **data)
+
+
+# ========================================================================
+def get_plot_data(cname, fnames, compute, **params):
+    """Plot data from the cache, computed and cached if out of date
+
+    compute returns a dictionary of the arrays each figure needs. The
+    rendering only uses these arrays so that changing the styling of a
+    figure does not redo the computations.
+    """
+    signature = get_signature(fnames, **params)
+    data = load(cname, signature)
+    if data is None:
+        data = compute()
+        save(cname, signature, data)
+    return data
@@ -8,19 +8,15 @@
 import argparse
 import os
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-import pandas as pd
-import utilities
-import definitions as defs
-
+from mcalister import utilities
+from mcalister import definitions as defs
+from mcalister import profiling
 
 # ========================================================================
 #
 # Some defaults variables
 #
 # ========================================================================
-plt.rc("text", usetex=True)
 cmap_med = [
     "#F15A60",
     "#7AC36A",
@@ -58,7 +54,8 @@ markertype = ["s", "d", "o", "p", "h"]
 # Main
 #
 # ========================================================================
-if __name__ == "__main__":
+def main():
+    """Plot the wing forces"""
 
     # Parse arguments
     parser = argparse.ArgumentParser(description="A simple plot tool for wing forces")
@@ -71,7 +68,15 @@ if __name__ == "__main__":
         type=str,
         required=True,
     )
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    profiling.setup(args)
+
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    import pandas as pd
+
+    plt.rc("text", usetex=True)
 
     # Loop on folders
     for k, folder in enumerate(args.folders):
@@ -79,8 +84,9 @@ if __name__ == "__main__":
         # Setup
         fdir = os.path.abspath(folder)
         yname = os.path.join(fdir, "mcalister.yaml")
-        oname = os.path.join(fdir, "forces.dat")
-        df = pd.read_csv(oname, delim_whitespace=True)
+        with profiling.stage("read", folder=fdir) as info:
+            df = utilities.get_forces(fdir)
+            info["rows"] = len(df)
         dim = defs.get_dimension(yname)
 
         area = defs.get_wing_area(dim)
@@ -95,7 +101,7 @@ if __name__ == "__main__":
         df["cd"] = ((df.Fpy + df.Fvy) * s + (df.Fpx + df.Fvx) * c) / (dynPres * area)
 
         # Experimental values
-        edir = os.path.abspath(os.path.join("exp_data", f"aoa-{aoa}"))
+        edir = os.path.join(defs.get_data_dir("exp_data"), f"aoa-{aoa}")
         df_cl_cd = pd.read_csv(os.path.join(edir, "cl_cd.txt"), comment="#")
         cl_exp = df_cl_cd.cl.iloc[0]
         cd_exp = df_cl_cd.cd.iloc[0]
@@ -129,7 +135,7 @@ if __name__ == "__main__":
             )
 
     fname = "wing_forces.pdf"
-    with PdfPages(fname) as pdf:
+    with profiling.stage("render"), PdfPages(fname) as pdf:
         # Format plots
         plt.figure(0)
         ax = plt.gca()
@@ -156,3 +162,8 @@ if __name__ == "__main__":
 
     if args.show:
         plt.show()
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,764 @@
+#!/usr/bin/env python3
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import argparse
+import os
+import sys
+import glob as glob
+import numpy as np
+from mcalister import utilities
+from mcalister import plot_data
+from mcalister import results
+from mcalister import definitions as defs
+from mcalister import probes
+from mcalister import vorticity
+from mcalister import profiling
+
+# ========================================================================
+#
+# Some defaults variables
+#
+# ========================================================================
+cmap_med = [
+    "#F15A60",
+    "#7AC36A",
+    "#5A9BD4",
+    "#FAA75B",
+    "#9E67AB",
+    "#CE7058",
+    "#D77FB4",
+    "#737373",
+]
+cmap = [
+    "#EE2E2F",
+    "#008C48",
+    "#185AA9",
+    "#F47D23",
+    "#662C91",
+    "#A21D21",
+    "#B43894",
+    "#010202",
+]
+dashseq = [
+    (None, None),
+    [10, 5],
+    [10, 4, 3, 4],
+    [3, 3],
+    [10, 4, 3, 4, 3, 4],
+    [3, 3],
+    [3, 3],
+]
+markertype = ["s", "d", "o", "p", "h"]
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def split_slices(fdir, aoa, xslices):
+    """Split the averaged vortex slices of a case into one file per slice
+
+    The rotation to the frame aligned with the freestream is applied
+    once here. The split files are kept until avg_slice.csv changes.
+    """
+    import pandas as pd
+
+    sname = os.path.join(fdir, "vortex_slices", "avg_slice.csv")
+    odir = os.path.join(fdir, "vortex_slices", "slices")
+    onames = [os.path.join(odir, f"slice_{k}.pkl") for k in range(len(xslices))]
+    if all(
+        os.path.exists(oname) and os.path.getmtime(oname) >= os.path.getmtime(sname)
+        for oname in onames
+    ):
+        return onames
+
+    with profiling.stage("read", folder=fdir) as info:
+        df = pd.read_csv(sname, delimiter=",")
+        renames = utilities.get_renames()
+        df.columns = [renames[col] for col in df.columns]
+        df.z -= defs.get_half_wing_length()
+        info["rows"] = len(df)
+
+    utilities.rotate_to_freestream(df, aoa)
+
+    os.makedirs(odir, exist_ok=True)
+    for oname, xslicet in zip(onames, xslices.xslicet):
+        df[np.fabs(df.xr - xslicet) < 1e-5].reset_index(drop=True).to_pickle(oname)
+    return onames
+
+
+# ========================================================================
+def get_reference_files(edir, sadir, xslices):
+    """Experimental and SA data files of each slice"""
+    fnames = {}
+    for k, (index, row) in enumerate(xslices.iterrows()):
+        for name in ["ux", "uz"]:
+            enames = glob.glob(os.path.join(edir, f"{name}_*_{row.xslice:.1f}.txt"))
+            fnames[f"exp_{name}_{k}"] = enames[0] if len(enames) > 0 else None
+        fnames[f"sa_{k}"] = os.path.join(sadir, f"uz_{row.xslicet:.1f}.csv")
+    return fnames
+
+
+# ========================================================================
+def iter_vortex_data(fdir, xslices, refs, ninterp=200, chord=1, npreview=None):
+    """Arrays of the vortex figures of a case, one slice at a time
+
+    For each slice: vortex core location and pressure (core_<k>), slice
+    bounds (lims_<k>), lineouts through the core (z_<k>, ux_<k>, uy_<k>),
+    velocity magnitude contours (zi_<k>, yi_<k>, vi_<k>), axial
+    vorticity and Q-criterion contours (wi_<k>, qi_<k>), circulation
+    around the core (r_<k>, gamma_<k>), vorticity at the core, peak
+    vorticity and peak Q (vort_<k>) and the reference curves when they
+    exist. The arrays of each slice are yielded (empty if the slice has
+    no data) before the next slice is loaded.
+    The standard errors of the lineouts (ux_se_<k>, uy_se_<k>) are
+    included when the averaged slices have them.
+
+    The lineouts and velocity magnitude contours are interpolated with
+    cubic griddata. With npreview, the vortex quantities, lineouts and
+    contours are computed on a stratified subsample of about npreview
+    points of each slice with linear interpolation (local least squares
+    fits of the nearest points for the lineouts). The error with respect to the full slice is
+    stored in err_<k> (max lineout error, rms and max contour error,
+    normalized by the freestream velocity, and the number of points).
+    """
+    import pandas as pd
+    import scipy.interpolate as spi
+
+    mm2m = 1e-3
+    exp_chord = 0.52
+    yname = os.path.join(fdir, "mcalister.yaml")
+    u0, v0, w0, umag0, rho0, mu = utilities.parse_ic(yname)
+    aoa = defs.get_aoa(fdir)
+    snames = split_slices(fdir, aoa, xslices)
+
+    for k, (index, row) in enumerate(xslices.iterrows()):
+        data = {}
+        subdf = pd.read_pickle(snames[k])
+        if len(subdf) == 0:
+            print(f"No data for x={row.xslicet} in {fdir}", file=sys.stderr)
+            yield data
+            continue
+        idx = subdf.p.idxmin()
+        ymin, ymax = np.min(subdf.yr), np.max(subdf.yr)
+        zmin, zmax = np.min(subdf.z), np.max(subdf.z)
+
+        # vortex center location
+        xc, yc, zc, pc = subdf.loc[idx, ["xr", "yr", "z", "p"]].values
+        data[f"core_{k}"] = np.array([xc, yc, zc, pc], dtype=np.float64)
+        data[f"lims_{k}"] = np.array([zmin, zmax, ymin, ymax], dtype=np.float64)
+
+        vcols = ["ux", "uy", "uz"]
+        subdf["magvel"] = np.sqrt(np.square(subdf[vcols]).sum(axis=1))
+
+        full = subdf
+        if npreview is not None:
+            with profiling.stage("decimate", folder=fdir, slice=k) as info:
+                sel = probes.decimate(full[["yr", "z"]].values, npreview, keep=[idx])
+                subdf = full.iloc[sel].reset_index(drop=True)
+                idx = int(np.searchsorted(sel, idx))
+                info["rows"] = len(subdf)
+
+        # vorticity, Q-criterion and circulation around the core (the
+        # operator of the subsample of the preview is not cached)
+        with profiling.stage("vorticity", folder=fdir, slice=k):
+            points = subdf[["yr", "z"]].values
+            operator = vorticity.get_gradient_operator(
+                points, os.path.dirname(snames[k]) if npreview is None else None
+            )
+            omega, q = vorticity.get_vortex_fields(
+                operator, subdf.uyr.values, subdf.uz.values
+            )
+            center = np.array([yc, zc])
+            radii = np.linspace(0, vorticity.get_max_radius(points, center), ninterp)
+            gamma = vorticity.get_circulation(
+                points, omega, operator["areas"], center, radii
+            )
+        subdf["omega"], subdf["q"] = omega, q
+        data[f"r_{k}"] = radii / chord
+        data[f"gamma_{k}"] = gamma / (umag0 * chord)
+        data[f"vort_{k}"] = np.array(
+            [
+                omega[idx] * chord / umag0,
+                np.max(np.fabs(omega)) * chord / umag0,
+                np.max(q) * (chord / umag0) ** 2,
+            ]
+        )
+
+        # interpolate across the vortex core
+        fields = ["uxr", "uyr"]
+        if "uxr_se" in subdf.columns:
+            fields += ["uxr_se", "uyr_se"]
+        zline = np.linspace(zmin, zmax, ninterp)
+        with profiling.stage("lineout", folder=fdir, slice=k):
+            if npreview is None:
+                # cubic interpolation of the published profiles
+                lineout = pd.DataFrame(
+                    spi.griddata(
+                        (subdf.yr, subdf.z),
+                        subdf[fields].values,
+                        (np.full(ninterp, yc), zline),
+                        method="cubic",
+                    ),
+                    columns=fields,
+                )
+            else:
+                trees = probes.build_slice_trees(subdf, "xr", ["yr", "z"])
+                lineout = probes.probe_line(
+                    trees,
+                    subdf,
+                    fields,
+                    row.xslicet,
+                    [yc, zmin],
+                    [yc, zmax],
+                    ninterp,
+                )
+        data[f"z_{k}"] = zline / chord
+        data[f"ux_{k}"] = lineout.uxr.values / umag0
+        data[f"uy_{k}"] = lineout.uyr.values / umag0
+        if "uxr_se" in lineout.columns:
+            data[f"ux_se_{k}"] = lineout.uxr_se.values / umag0
+            data[f"uy_se_{k}"] = lineout.uyr_se.values / umag0
+
+        # contours of the velocity magnitude
+        yi = np.linspace(ymin, ymax, ninterp)
+        zi = np.linspace(zmin, zmax, ninterp)
+        method = "cubic" if npreview is None else "linear"
+        with profiling.stage("griddata", folder=fdir, slice=k) as info:
+            vi = spi.griddata(
+                (subdf.yr, subdf.z),
+                subdf.magvel,
+                (yi[None, :], zi[:, None]),
+                method=method,
+            )
+            info["rows"] = len(subdf)
+        data[f"zi_{k}"], data[f"yi_{k}"], data[f"vi_{k}"] = zi, yi, vi.T
+
+        # contours of the axial vorticity and of Q = 0
+        with profiling.stage("griddata", folder=fdir, slice=k):
+            wi, qi = spi.griddata(
+                (subdf.yr, subdf.z),
+                subdf[["omega", "q"]].values,
+                (yi[None, :], zi[:, None]),
+                method="linear",
+            ).T
+        data[f"wi_{k}"] = wi * chord / umag0
+        data[f"qi_{k}"] = qi * (chord / umag0) ** 2
+
+        # approximation error with respect to the full slice
+        if npreview is not None:
+            with profiling.stage("error", folder=fdir, slice=k):
+                trees = probes.get_slice_trees(snames[k], full, "xr", ["yr", "z"])
+                ref = probes.probe_line(
+                    trees,
+                    full,
+                    ["uxr", "uyr"],
+                    row.xslicet,
+                    [yc, zmin],
+                    [yc, zmax],
+                    ninterp,
+                )
+                diff = ref.values - lineout[["uxr", "uyr"]].values
+                lerr = np.nanmax(np.fabs(diff)) / umag0
+                dropped = np.setdiff1d(np.arange(len(full)), sel)
+                vd = spi.griddata(
+                    (subdf.yr, subdf.z),
+                    subdf.magvel,
+                    (full.yr.values[dropped], full.z.values[dropped]),
+                    method="linear",
+                )
+                cerr = np.fabs(vd - full.magvel.values[dropped]) / umag0
+                cerr = cerr[np.isfinite(cerr)]
+                if len(cerr) == 0:
+                    cerr = np.zeros(1)
+            data[f"err_{k}"] = np.array(
+                [lerr, np.sqrt(np.mean(cerr ** 2)), cerr.max(), len(subdf), len(full)]
+            )
+        del subdf, full
+
+        # Experimental data
+        if refs[f"exp_ux_{k}"] is not None and refs[f"exp_uz_{k}"] is not None:
+            exp_ux_df = pd.read_csv(refs[f"exp_ux_{k}"], header=0, names=["z", "ux"])
+            exp_uy_df = pd.read_csv(refs[f"exp_uz_{k}"], header=0, names=["z", "uy"])
+
+            # Change units
+            data[f"exp_ux_z_{k}"] = exp_ux_df.z.values * mm2m / exp_chord
+            data[f"exp_ux_{k}"] = exp_ux_df.ux.values
+            data[f"exp_uy_z_{k}"] = exp_uy_df.z.values * mm2m / exp_chord
+            data[f"exp_uy_{k}"] = exp_uy_df.uy.values
+
+        # Load corresponding SA data
+        try:
+            sadf = pd.read_csv(refs[f"sa_{k}"])
+            data[f"sa_z_{k}"] = sadf.y.values
+            data[f"sa_uy_{k}"] = sadf.uz.values
+        except FileNotFoundError:
+            pass
+
+        yield data
+
+
+# ========================================================================
+def get_vortex_data(fdir, xslices, refs, ninterp=200, chord=1, npreview=None):
+    """Arrays of the vortex figures of a case (see iter_vortex_data)"""
+    data = {}
+    for sdata in iter_vortex_data(fdir, xslices, refs, ninterp, chord, npreview):
+        data.update(sdata)
+    return data
+
+
+# ========================================================================
+def get_slice(key):
+    """Slice index of a plot data array (name ending in _<k>)"""
+    return int(key.rsplit("_", 1)[1])
+
+
+# ========================================================================
+def iter_slice_data(data, nslices):
+    """Arrays of each slice of the plot data of a case"""
+    for k in range(nslices):
+        yield {key: val for key, val in data.items() if get_slice(key) == k}
+
+
+# ========================================================================
+def get_case_inputs(fdir, xslices, ninterp=200, chord=1, npreview=None, cname=None):
+    """Cache file (cname), input files (fnames), parameters (params) and
+    reference files (refs) of the plot data of a case and its label"""
+    yname = os.path.join(fdir, "mcalister.yaml")
+    aoa = defs.get_aoa(fdir)
+
+    # experimental values and data from other CFD simulations (SA model)
+    edir = os.path.join(defs.get_data_dir("exp_data"), f"aoa-{aoa}")
+    sadir = os.path.join(defs.get_data_dir("sitaraman_data"), f"aoa-{aoa}")
+    refs = get_reference_files(edir, sadir, xslices)
+
+    fnames = [yname, os.path.join(fdir, "vortex_slices", "avg_slice.csv")] + [
+        f for f in refs.values() if f is not None
+    ]
+    if cname is None:
+        suffix = "" if npreview is None else ".preview"
+        cname = os.path.join(fdir, "vortex_slices", f"plot_vortex{suffix}.npz")
+    params = {
+        "xslices": xslices.xslice.tolist(),
+        "ninterp": ninterp,
+        "chord": chord,
+        "npreview": npreview,
+        "vorticity": True,
+        "lineout": "cubic",
+        "edir": edir,
+        "sadir": sadir,
+    }
+    return {
+        "cname": cname,
+        "fnames": fnames,
+        "params": params,
+        "refs": refs,
+        "label": f"SST {aoa}",
+    }
+
+
+# ========================================================================
+def get_case_data(fdir, xslices, ninterp=200, chord=1, npreview=None, cname=None):
+    """Plot data of a case, only recomputed when the inputs change
+
+    The data is cached in cname (by default next to the averaged
+    slices). Returns the data and the label of the case.
+    """
+    inputs = get_case_inputs(fdir, xslices, ninterp, chord, npreview, cname)
+    data = plot_data.get_plot_data(
+        inputs["cname"],
+        inputs["fnames"],
+        lambda: get_vortex_data(
+            fdir, xslices, inputs["refs"], ninterp, chord, npreview
+        ),
+        **inputs["params"],
+    )
+    return data, inputs["label"]
+
+
+# ========================================================================
+def iter_case_data(fdir, xslices, inputs, ninterp=200, chord=1, npreview=None):
+    """Plot data of a case one slice at a time (see get_case_data)
+
+    inputs is given by get_case_inputs. The cached data is used if it is
+    up to date. Otherwise each slice is computed when it is asked for
+    and the cache is written after the last one.
+    """
+    signature = plot_data.get_signature(inputs["fnames"], **inputs["params"])
+    data = plot_data.load(inputs["cname"], signature)
+    if data is not None:
+        yield from iter_slice_data(data, len(xslices))
+        return
+
+    # the cache is written before the last slice is handed over so that
+    # it does not depend on the caller asking for more
+    data = {}
+    refs = inputs["refs"]
+    slices = iter_vortex_data(fdir, xslices, refs, ninterp, chord, npreview)
+    for k, sdata in enumerate(slices):
+        data.update(sdata)
+        if k == len(xslices) - 1:
+            plot_data.save(inputs["cname"], signature, data)
+        yield sdata
+
+
+# ========================================================================
+def print_preview_errors(fdir, data, xslices):
+    """Print the approximation error of the preview of each slice"""
+    import pandas as pd
+
+    ks = [k for k in range(len(xslices)) if f"err_{k}" in data]
+    errors = pd.DataFrame(
+        [data[f"err_{k}"] for k in ks],
+        columns=["lineout_max", "contour_rms", "contour_max", "npts", "nfull"],
+    )
+    errors.insert(0, "x", xslices.xslicet.values[ks])
+    print(f"Preview error (relative to the freestream velocity) for {fdir}")
+    print(errors.to_string(index=False, float_format=lambda x: f"{x:.3g}"))
+
+
+# ========================================================================
+def plot_band(x, y, se, color):
+    """Shade two standard errors of the time average around a curve"""
+    import matplotlib.pyplot as plt
+
+    plt.fill_between(x, y - 2 * se, y + 2 * se, color=color, alpha=0.4, lw=0)
+
+
+# ========================================================================
+def format_figure(
+    pdf, xlabel, ylabel, title=None, xlim=None, ylim=None, legend=False, dpi=300
+):
+    """Format the current figure and save it to the pdf"""
+    import matplotlib.pyplot as plt
+
+    ax = plt.gca()
+    plt.xlabel(xlabel, fontsize=22, fontweight="bold")
+    plt.ylabel(ylabel, fontsize=22, fontweight="bold")
+    plt.setp(ax.get_xmajorticklabels(), fontsize=16, fontweight="bold")
+    plt.setp(ax.get_ymajorticklabels(), fontsize=16, fontweight="bold")
+    if xlim is not None:
+        ax.set_xlim(xlim)
+    if ylim is not None:
+        ax.set_ylim(ylim)
+    if title is not None:
+        ax.set_title(title)
+    if legend:
+        ax.legend(loc="best")
+    plt.tight_layout()
+    pdf.savefig(dpi=dpi)
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Plot the vortex quantities"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="A simple plot tool for vortex quantities"
+    )
+    parser.add_argument("-s", "--show", help="Show the plots", action="store_true")
+    parser.add_argument(
+        "-f",
+        "--folders",
+        nargs="+",
+        help="Folder where files are stored",
+        type=str,
+    )
+    parser.add_argument("--db", help="Results database (see results.py)", type=str)
+    parser.add_argument(
+        "-w",
+        "--where",
+        help="Plot the runs of the database matching an SQL condition",
+        type=str,
+    )
+    parser.add_argument(
+        "--preview",
+        help="Quick look on a subsample of about PREVIEW points per slice",
+        nargs="?",
+        const=2000,
+        type=int,
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    if args.where is not None and args.db is None:
+        parser.error("--where needs a database (--db)")
+    if args.folders is None and args.where is None:
+        parser.error("give the folders (-f) or select runs of a database (--where)")
+    profiling.setup(args)
+
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    import pandas as pd
+
+    plt.rc("text", usetex=True)
+
+    # Constants
+    ninterp = 200 if args.preview is None else 50
+    chord = 1
+    dpi = 300 if args.preview is None else 100
+    xslices = utilities.get_vortex_slices()
+    xslices["xslicet"] = xslices.xslice + 1
+
+    # Cases to plot
+    con = None if args.db is None else results.connect(args.db)
+    folders = [] if args.folders is None else list(args.folders)
+    if args.where is not None:
+        folders += results.get_runs(con, args.where).path.tolist()
+    cases = []
+    for i, folder in enumerate(folders):
+        fdir = os.path.abspath(folder)
+        run = None
+        if con is not None and args.preview is None:
+            run = results.get_run_data(con, args.db, fdir, "vortex")
+        if run is not None:
+            # ingested runs are read from the database only
+            data, meta = run
+            label = f"SST {meta['aoa']:g}"
+            slices = iter_slice_data(data, len(xslices))
+        else:
+            try:
+                inputs = get_case_inputs(fdir, xslices, ninterp, chord, args.preview)
+            except (OSError, KeyError, ValueError) as exc:
+                print(f"Skipping {fdir}: {exc}", file=sys.stderr)
+                continue
+            label = inputs["label"]
+            slices = iter_case_data(fdir, xslices, inputs, ninterp, chord, args.preview)
+        cases.append(
+            {"i": i, "fdir": fdir, "label": label, "slices": slices, "summary": {}}
+        )
+
+    # Slice by slice: get the plot data of the slice for all the cases
+    # (only recomputed when the inputs change), plot them, save the pages
+    # and close them. Only the cores, peak vorticity and preview errors
+    # are kept for the last pages.
+    fname = "vortex.pdf" if args.preview is None else "vortex_preview.pdf"
+    with profiling.stage("render"), PdfPages(fname) as pdf:
+        for k, (index, row) in enumerate(xslices.iterrows()):
+            for case in list(cases):
+                try:
+                    case["data"] = next(case["slices"])
+                except (OSError, KeyError, ValueError) as exc:
+                    print(f"Skipping {case['fdir']}: {exc}", file=sys.stderr)
+                    cases.remove(case)
+                    continue
+                for name in ["core", "vort", "err"]:
+                    if f"{name}_{k}" in case["data"]:
+                        case["summary"][f"{name}_{k}"] = case["data"][f"{name}_{k}"]
+
+            slice_cases = [case for case in cases if f"core_{k}" in case["data"]]
+            if len(slice_cases) == 0:
+                continue
+            zlims = slice_cases[-1]["data"][f"lims_{k}"][:2]
+            title = r"$x={0:.2f}$".format(row.xslicet)
+
+            # Lineouts through the vortex core
+            fig_ux = plt.figure()
+            for case in slice_cases:
+                i, data = case["i"], case["data"]
+                if f"ux_se_{k}" in data:
+                    plot_band(
+                        data[f"z_{k}"], data[f"ux_{k}"], data[f"ux_se_{k}"], cmap_med[i]
+                    )
+                p = plt.plot(
+                    data[f"z_{k}"],
+                    data[f"ux_{k}"],
+                    ls="-",
+                    lw=2,
+                    color=cmap[i],
+                    label=case["label"],
+                )
+                p[0].set_dashes(dashseq[i])
+            data = slice_cases[0]["data"]
+            if f"exp_ux_{k}" in data:
+                plt.plot(
+                    data[f"exp_ux_z_{k}"],
+                    data[f"exp_ux_{k}"],
+                    ls="-",
+                    lw=1,
+                    color=cmap[-1],
+                    marker=markertype[0],
+                    mec=cmap[-1],
+                    mfc=cmap[-1],
+                    ms=6,
+                    label="Exp.",
+                )
+            format_figure(
+                pdf,
+                r"$z/c$",
+                r"$u_x/u_\infty$",
+                title=title,
+                xlim=zlims,
+                legend=True,
+                dpi=dpi,
+            )
+
+            fig_uy = plt.figure()
+            for case in slice_cases:
+                i, data = case["i"], case["data"]
+                if f"uy_se_{k}" in data:
+                    plot_band(
+                        data[f"z_{k}"], data[f"uy_{k}"], data[f"uy_se_{k}"], cmap_med[i]
+                    )
+                p = plt.plot(
+                    data[f"z_{k}"], data[f"uy_{k}"], ls="-", lw=2, color=cmap[i]
+                )
+                p[0].set_dashes(dashseq[i])
+            data = slice_cases[0]["data"]
+            if f"exp_uy_{k}" in data:
+                plt.plot(
+                    data[f"exp_uy_z_{k}"],
+                    data[f"exp_uy_{k}"],
+                    ls="-",
+                    lw=1,
+                    color=cmap[-1],
+                    marker=markertype[0],
+                    mec=cmap[-1],
+                    mfc=cmap[-1],
+                    ms=6,
+                    label="Exp.",
+                )
+            if f"sa_z_{k}" in data:
+                p = plt.plot(
+                    data[f"sa_z_{k}"],
+                    data[f"sa_uy_{k}"],
+                    ls="-",
+                    color=cmap[-2],
+                    label="Sitaraman et al. (2010)",
+                )
+                p[0].set_dashes(dashseq[-1])
+            format_figure(
+                pdf, r"$z/c$", r"$u_y/u_\infty$", title=title, xlim=zlims, dpi=dpi
+            )
+
+            # Contours of the first case
+            data = slice_cases[0]["data"]
+            xc, yc, zc, pc = data[f"core_{k}"]
+            zmin, zmax, ymin, ymax = data[f"lims_{k}"]
+            fig_ctr = plt.figure()
+            CS = plt.contourf(data[f"zi_{k}"], data[f"yi_{k}"], data[f"vi_{k}"], 15)
+            plt.plot(zc, yc, "ok", ms=5)
+            plt.plot([zmin, zmax], [yc, yc], ls="--", lw=1, color=cmap[-1])
+            plt.colorbar()
+            format_figure(
+                pdf,
+                r"$z/c$",
+                r"$y/c$",
+                title=title,
+                xlim=(zmin, zmax),
+                ylim=(ymin, ymax),
+                dpi=dpi,
+            )
+            figs = [fig_ux, fig_uy, fig_ctr]
+
+            # Axial vorticity and vortex boundary (Q = 0) of the first case
+            if f"wi_{k}" in data:
+                figs.append(plt.figure())
+                plt.contourf(
+                    data[f"zi_{k}"], data[f"yi_{k}"], data[f"wi_{k}"], 15, cmap="RdBu_r"
+                )
+                plt.colorbar()
+                plt.contour(
+                    data[f"zi_{k}"],
+                    data[f"yi_{k}"],
+                    data[f"qi_{k}"],
+                    levels=[0],
+                    colors="k",
+                    linewidths=1,
+                )
+                plt.plot(zc, yc, "ok", ms=5)
+                format_figure(
+                    pdf,
+                    r"$z/c$",
+                    r"$y/c$",
+                    title=title + r", $\omega_x c/u_\infty$",
+                    xlim=(zmin, zmax),
+                    ylim=(ymin, ymax),
+                    dpi=dpi,
+                )
+
+            # Circulation around the vortex core
+            figs.append(plt.figure())
+            for case in slice_cases:
+                i, data = case["i"], case["data"]
+                if f"gamma_{k}" not in data:
+                    continue
+                p = plt.plot(
+                    data[f"r_{k}"],
+                    data[f"gamma_{k}"],
+                    ls="-",
+                    lw=2,
+                    color=cmap[i],
+                    label=case["label"],
+                )
+                p[0].set_dashes(dashseq[i])
+            format_figure(
+                pdf,
+                r"$r/c$",
+                r"$\Gamma/(u_\infty c)$",
+                title=title,
+                legend=True,
+                dpi=dpi,
+            )
+            if not args.show:
+                for fig in figs:
+                    plt.close(fig)
+
+        # Approximation error of the preview
+        if args.preview is not None:
+            for case in cases:
+                print_preview_errors(case["fdir"], case["summary"], xslices)
+
+        # Pressure at the vortex core
+        plt.figure("vortex_core")
+        for case in cases:
+            i, data = case["i"], case["summary"]
+            vortex_core = pd.DataFrame(
+                [data[f"core_{k}"] for k in range(len(xslices)) if f"core_{k}" in data],
+                columns=["xc", "yc", "zc", "pc"],
+            )
+            p = plt.plot(
+                vortex_core.xc,
+                vortex_core.pc,
+                lw=2,
+                marker=markertype[i],
+                color=cmap[i],
+                label="folder",
+            )
+            p[0].set_dashes(dashseq[i])
+        format_figure(pdf, r"$x/c$", r"$p$", dpi=dpi)
+
+        # Peak axial vorticity
+        plt.figure("vortex_vorticity")
+        for case in cases:
+            i, data = case["i"], case["summary"]
+            ks = [k for k in range(len(xslices)) if f"vort_{k}" in data]
+            p = plt.plot(
+                xslices.xslicet.values[ks],
+                [data[f"vort_{k}"][1] for k in ks],
+                lw=2,
+                marker=markertype[i],
+                color=cmap[i],
+                label=case["label"],
+            )
+            p[0].set_dashes(dashseq[i])
+        format_figure(
+            pdf, r"$x/c$", r"$\max |\omega_x| c/u_\infty$", legend=True, dpi=dpi
+        )
+
+    if args.show:
+        plt.show()
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import argparse
+import os
+import sys
+import glob as glob
+import numpy as np
+from mcalister import utilities
+from mcalister import plot_data
+from mcalister import results
+from mcalister import probes
+from mcalister import definitions as defs
+from mcalister import profiling
+
+# ========================================================================
+#
+# Some defaults variables
+#
+# ========================================================================
+cmap_med = [
+    "#F15A60",
+    "#7AC36A",
+    "#5A9BD4",
+    "#FAA75B",
+    "#9E67AB",
+    "#CE7058",
+    "#D77FB4",
+    "#737373",
+]
+cmap = [
+    "#EE2E2F",
+    "#008C48",
+    "#185AA9",
+    "#F47D23",
+    "#662C91",
+    "#A21D21",
+    "#B43894",
+    "#010202",
+]
+dashseq = [
+    (None, None),
+    [10, 5],
+    [10, 4, 3, 4],
+    [3, 3],
+    [10, 4, 3, 4, 3, 4],
+    [3, 3],
+    [3, 3],
+]
+markertype = ["s", "d", "o", "p", "h"]
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_reference_files(edir, sadir, zslices):
+    """Experimental and SA data files of each slice"""
+    fnames = {}
+    for k, (index, row) in enumerate(zslices.iterrows()):
+        enames = glob.glob(os.path.join(edir, f"cp_*_{row.zslicen:.3f}.txt"))
+        fnames[f"exp_{k}"] = enames[0] if len(enames) > 0 else None
+        fnames[f"satop_{k}"] = os.path.join(sadir, f"cp_{row.zslicen:.3f}_top.csv")
+        fnames[f"sabot_{k}"] = os.path.join(sadir, f"cp_{row.zslicen:.3f}_bot.csv")
+    return fnames
+
+
+# ========================================================================
+def get_wing_data(fdir, zslices, refs, npreview=None):
+    """Arrays of the cp figures of a case
+
+    For each slice: cp along the wing surface (x_<k>, cp_<k>) and the
+    reference curves (exp_x_<k>, exp_cp_<k>, sa_x_<k>, sa_cp_<k>) when
+    they exist. The standard error of cp (cp_se_<k>) is included when
+    the averaged slices have one.
+
+    With npreview, about npreview points are kept along the surface
+    (stratified in arc length). The max error of the linear
+    interpolation of the kept points is stored in err_<k> with the
+    number of points.
+    """
+    import pandas as pd
+
+    yname = os.path.join(fdir, "mcalister.yaml")
+    u0, v0, w0, umag0, rho0, mu = utilities.parse_ic(yname)
+
+    # Read in data
+    with profiling.stage("read", folder=fdir) as info:
+        df = pd.read_csv(os.path.join(fdir, "wing_slices", "avg_slice.csv"))
+        renames = utilities.get_renames()
+        df.columns = [renames[col] for col in df.columns]
+        segments = pd.read_csv(os.path.join(fdir, "wing_slices", "segments.csv"))
+        info["rows"] = len(df)
+
+    # # Project coordinates on to chord axis
+    # ang = np.radians(aoa)
+    # crdvec = np.array([np.cos(ang), -np.sin(ang)])
+    # rotcen = 0.25
+    # df["xovc"] = (
+    #     np.dot(np.asarray([df.x - rotcen, df.y]).T, crdvec) / chord + rotcen
+    # )
+
+    # Calculate the negative of the surface pressure coefficient
+    df["cp"] = -df.p / (0.5 * rho0 * umag0 ** 2)
+    if "p_se" in df.columns:
+        df["cp_se"] = df.p_se / (0.5 * rho0 * umag0 ** 2)
+
+    data = {}
+    for k, (index, row) in enumerate(zslices.iterrows()):
+        subdf = df[np.fabs(df.z - row.zslice) < 1e-5]
+        subseg = segments[np.fabs(segments.z0 - row.zslice) < 1e-5]
+
+        # Order the points along the wing surface
+        with profiling.stage("contour", folder=fdir, slice=k) as info:
+            order = utilities.get_contour(
+                subdf.x.values, subdf.y.values, subseg[["x0", "y0", "x1", "y1"]].values
+            )
+            upper, lower = utilities.split_contour(
+                subdf.x.values, subdf.y.values, order
+            )
+            info["rows"] = len(subdf)
+        idx = np.concatenate((upper[::-1], lower[1:]))
+        x, y, cp = subdf.x.values[idx], subdf.y.values[idx], subdf.cp.values[idx]
+        if "cp_se" in subdf.columns:
+            data[f"cp_se_{k}"] = subdf.cp_se.values[idx]
+
+        if npreview is not None:
+            arc = np.concatenate(([0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))))
+            sel = probes.decimate(arc, npreview, keep=[0, len(upper) - 1, len(x) - 1])
+            err = np.fabs(np.interp(arc, arc[sel], cp[sel]) - cp)
+            data[f"err_{k}"] = np.array([err.max(), len(sel), len(x)])
+            x, cp = x[sel], cp[sel]
+            if f"cp_se_{k}" in data:
+                data[f"cp_se_{k}"] = data[f"cp_se_{k}"][sel]
+        data[f"x_{k}"] = x
+        data[f"cp_{k}"] = cp
+
+        # Load corresponding exp data
+        if refs[f"exp_{k}"] is not None:
+            exp_df = pd.read_csv(refs[f"exp_{k}"], header=0, names=["x", "cp"])
+            data[f"exp_x_{k}"] = exp_df.x.values
+            data[f"exp_cp_{k}"] = exp_df.cp.values
+
+        # Load corresponding SA data
+        try:
+            satop = pd.read_csv(refs[f"satop_{k}"])
+            sabot = pd.read_csv(refs[f"sabot_{k}"])
+        except FileNotFoundError:
+            continue
+        satop.sort_values(by=["x"], inplace=True)
+        sabot.sort_values(by=["x"], inplace=True, ascending=False)
+        data[f"sa_x_{k}"] = np.concatenate((satop.x, sabot.x), axis=0)
+        data[f"sa_cp_{k}"] = np.concatenate((satop.cp, sabot.cp), axis=0)
+
+    return data
+
+
+# ========================================================================
+def get_case_data(fdir, npreview=None, cname=None):
+    """Plot data of a case, only recomputed when the inputs change
+
+    The data is cached in cname (by default next to the averaged
+    slices). Returns the data, the slices and the label of the case.
+    """
+    yname = os.path.join(fdir, "mcalister.yaml")
+    dim = defs.get_dimension(yname)
+    aoa = defs.get_aoa(fdir)
+    zslices = utilities.get_wing_slices(dim)
+    zslices["zslicen"] = zslices.zslice / defs.get_half_wing_length()
+
+    # experimental values and data from other CFD simulations (SA model)
+    edir = os.path.join(defs.get_data_dir("exp_data"), f"aoa-{aoa}")
+    sadir = os.path.join(defs.get_data_dir("sitaraman_data"), f"aoa-{aoa}")
+    refs = get_reference_files(edir, sadir, zslices)
+
+    fnames = [
+        yname,
+        os.path.join(fdir, "wing_slices", "avg_slice.csv"),
+        os.path.join(fdir, "wing_slices", "segments.csv"),
+    ] + [f for f in refs.values() if f is not None]
+    if cname is None:
+        suffix = "" if npreview is None else ".preview"
+        cname = os.path.join(fdir, "wing_slices", f"plot_wing{suffix}.npz")
+    data = plot_data.get_plot_data(
+        cname,
+        fnames,
+        lambda: get_wing_data(fdir, zslices, refs, npreview),
+        zslices=zslices.zslice.tolist(),
+        edir=edir,
+        sadir=sadir,
+        npreview=npreview,
+    )
+    return data, zslices, f"SST {aoa} {dim}D"
+
+
+# ========================================================================
+def get_run_data(con, dbname, fdir):
+    """Plot data, slices and label of a run of the results database
+    (None if it was not ingested), without reading the run folder"""
+    run = results.get_run_data(con, dbname, fdir, "wing")
+    if run is None:
+        return None
+    data, meta = run
+    zslices = utilities.get_wing_slices(meta["dim"])
+    zslices["zslicen"] = zslices.zslice / defs.get_half_wing_length()
+    return data, zslices, f"SST {meta['aoa']:g} {meta['dim']}D"
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Plot the wing quantities"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="A simple plot tool for wing quantities"
+    )
+    parser.add_argument("-s", "--show", help="Show the plots", action="store_true")
+    parser.add_argument(
+        "-f",
+        "--folders",
+        nargs="+",
+        help="Folder where files are stored",
+        type=str,
+    )
+    parser.add_argument("--db", help="Results database (see results.py)", type=str)
+    parser.add_argument(
+        "-w",
+        "--where",
+        help="Plot the runs of the database matching an SQL condition",
+        type=str,
+    )
+    parser.add_argument(
+        "--preview",
+        help="Quick look on a subsample of about PREVIEW points per slice",
+        nargs="?",
+        const=200,
+        type=int,
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    if args.where is not None and args.db is None:
+        parser.error("--where needs a database (--db)")
+    if args.folders is None and args.where is None:
+        parser.error("give the folders (-f) or select runs of a database (--where)")
+    profiling.setup(args)
+
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    import pandas as pd
+
+    plt.rc("text", usetex=True)
+
+    # Constants
+    chord = 1
+    dpi = 300 if args.preview is None else 100
+
+    # Plot data of each case (only recomputed when the inputs change)
+    con = None if args.db is None else results.connect(args.db)
+    folders = [] if args.folders is None else list(args.folders)
+    if args.where is not None:
+        folders += results.get_runs(con, args.where).path.tolist()
+    if len(folders) == 0:
+        print(f"No runs matching {args.where} in {args.db}", file=sys.stderr)
+        return
+    cases = []
+    for i, folder in enumerate(folders):
+        fdir = os.path.abspath(folder)
+        run = None
+        if con is not None and args.preview is None:
+            run = get_run_data(con, args.db, fdir)
+        if run is not None:
+            data, zslices, label = run
+        else:
+            data, zslices, label = get_case_data(fdir, args.preview)
+        cases.append(
+            {"i": i, "label": label, "data": data, "zs": zslices.zslicen.values}
+        )
+
+        # Approximation error of the preview
+        if args.preview is not None:
+            errors = pd.DataFrame(
+                [data[f"err_{k}"] for k in range(len(zslices))],
+                columns=["cp_max", "npts", "nfull"],
+            )
+            errors.insert(0, "z/s", zslices.zslicen.values)
+            print(f"Preview error for {fdir}")
+            print(errors.to_string(index=False, float_format=lambda x: f"{x:.3g}"))
+
+    # Slices of all the cases (2D and 3D cases have different slices)
+    locations = []
+    for case in cases:
+        for zs in case["zs"]:
+            if not np.any(np.isclose(zs, locations)):
+                locations.append(zs)
+
+    # Plot cp in each slice
+    fname = "wing_cp.pdf" if args.preview is None else "wing_cp_preview.pdf"
+    with profiling.stage("render"), PdfPages(fname) as pdf:
+
+        for n, zs in enumerate(locations):
+            slice_cases = [
+                (case, np.flatnonzero(np.isclose(case["zs"], zs))[0])
+                for case in cases
+                if np.any(np.isclose(case["zs"], zs))
+            ]
+            fig = plt.figure(n)
+            for case, k in slice_cases:
+                i, data = case["i"], case["data"]
+                if f"x_{k}" not in data:
+                    continue
+
+                # two standard errors of the time average
+                if f"cp_se_{k}" in data:
+                    plt.fill_between(
+                        data[f"x_{k}"],
+                        data[f"cp_{k}"] - 2 * data[f"cp_se_{k}"],
+                        data[f"cp_{k}"] + 2 * data[f"cp_se_{k}"],
+                        color=cmap_med[i],
+                        alpha=0.4,
+                        lw=0,
+                    )
+                p = plt.plot(
+                    data[f"x_{k}"],
+                    data[f"cp_{k}"],
+                    ls="-",
+                    lw=2,
+                    color=cmap[i],
+                    label=case["label"],
+                )
+                p[0].set_dashes(dashseq[i])
+
+            # Reference data
+            case, k = slice_cases[0]
+            data = case["data"]
+            if f"exp_x_{k}" in data:
+                plt.plot(
+                    data[f"exp_x_{k}"],
+                    data[f"exp_cp_{k}"],
+                    ls="",
+                    color=cmap[-1],
+                    marker=markertype[0],
+                    ms=6,
+                    mec=cmap[-1],
+                    mfc=cmap[-1],
+                    label="Exp.",
+                )
+            if f"sa_x_{k}" in data:
+                p = plt.plot(
+                    data[f"sa_x_{k}"],
+                    data[f"sa_cp_{k}"],
+                    ls="-",
+                    color=cmap[-2],
+                    label="Sitaraman et al. (2010)",
+                )
+                p[0].set_dashes(dashseq[-1])
+
+            ax = plt.gca()
+            plt.xlabel(r"$x/c$", fontsize=22, fontweight="bold")
+            plt.ylabel(r"$-c_p$", fontsize=22, fontweight="bold")
+            plt.setp(ax.get_xmajorticklabels(), fontsize=16, fontweight="bold")
+            plt.setp(ax.get_ymajorticklabels(), fontsize=16, fontweight="bold")
+            plt.xlim([0, chord])
+            plt.ylim([-1.5, 5.5])
+            ax.set_title(r"$z/s={0:.3f}$".format(zs))
+            plt.tight_layout()
+            if n == 0:
+                legend = ax.legend(loc="best")
+            pdf.savefig(dpi=dpi)
+            if not args.show:
+                plt.close(fig)
+
+    if args.show:
+        plt.show()
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
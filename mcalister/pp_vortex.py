@@ -12,7 +12,9 @@ import glob
 import shutil
 import math
 import argparse
-import definitions as defs
+from mcalister import definitions as defs
+from mcalister import utilities
+from mcalister import profiling
 
 # ----------------------------------------------------------------
 # setup
@@ -22,7 +24,16 @@ parser = argparse.ArgumentParser(description="Post process using paraview")
 parser.add_argument(
     "-f", "--folder", help="Folder to post process", type=str, required=True
 )
+parser.add_argument(
+    "-c",
+    "--compress",
+    help="Compress the slice files",
+    type=str,
+    choices=["gzip", "zstd"],
+)
+profiling.add_arguments(parser)
 args = parser.parse_args()
+profiling.setup(args)
 
 # Get file names
 fdir = os.path.abspath(args.folder)
@@ -118,11 +129,26 @@ clip4.ClipType.Normal = [0.0, 0.0, 1.0]
 # ----------------------------------------------------------------
 # save data
 # ----------------------------------------------------------------
-SaveData(
-    oname,
+save_options = dict(
     proxy=clip4,
     Precision=5,
     UseScientificNotation=0,
     WriteTimeSteps=1,
     FieldAssociation="Points",
 )
+if args.compress is None:
+    with profiling.stage("extract", folder=fdir):
+        SaveData(oname, **save_options)
+
+else:
+    # write one time step at a time and compress its files (one per
+    # rank) right away so that the uncompressed slices never pile up
+    times = exoreader.TimestepValues
+    if not isinstance(times, (list, tuple)):
+        times = [times]
+    for step in range(len(times)):
+        with profiling.stage("extract", folder=fdir, step=step):
+            SaveData(oname, FrameWindow=[step, step], **save_options)
+        with profiling.stage("compress", folder=fdir, step=step):
+            for fname in glob.glob(os.path.join(odir, "output*.csv")):
+                utilities.compress_file(fname, args.compress)
@@ -11,7 +11,9 @@ import os
 import glob
 import shutil
 import argparse
-import definitions as defs
+from mcalister import definitions as defs
+from mcalister import utilities
+from mcalister import profiling
 
 # ----------------------------------------------------------------
 # setup
@@ -21,7 +23,16 @@ parser = argparse.ArgumentParser(description="Post process using paraview")
 parser.add_argument(
     "-f", "--folder", help="Folder to post process", type=str, required=True
 )
+parser.add_argument(
+    "-c",
+    "--compress",
+    help="Compress the slice files",
+    type=str,
+    choices=["gzip", "zstd"],
+)
+profiling.add_arguments(parser)
 args = parser.parse_args()
+profiling.setup(args)
 
 # Get file names
 fdir = os.path.abspath(args.folder)
@@ -35,6 +46,7 @@ odir = os.path.join(os.path.dirname(fdir), "wing_slices")
 shutil.rmtree(odir, ignore_errors=True)
 os.makedirs(odir)
 oname = os.path.join(odir, "output.csv")
+sname = os.path.join(odir, "segments.csv")
 
 # ----------------------------------------------------------------
 # setup the data processing pipelines
@@ -86,14 +98,66 @@ elif dim == 3:
     slice1.SliceType.Normal = [0.0, 0.0, 1.0]
     saveinput = slice1
 
+# create a new 'ProgrammableFilter' to keep the connectivity of the
+# line cells so that the points can be ordered along the surface
+segments1 = ProgrammableFilter(Input=saveinput)
+segments1.OutputDataSetType = "vtkTable"
+segments1.Script = """
+import numpy as np
+from vtk.util import numpy_support
+
+pdi = self.GetInputDataObject(0, 0)
+blocks = []
+if pdi.IsA("vtkCompositeDataSet"):
+    it = pdi.NewIterator()
+    it.InitTraversal()
+    while not it.IsDoneWithTraversal():
+        blocks.append(it.GetCurrentDataObject())
+        it.GoToNextItem()
+else:
+    blocks = [pdi]
+
+segs = []
+for block in blocks:
+    for c in range(block.GetNumberOfCells()):
+        ids = block.GetCell(c).GetPointIds()
+        for j in range(ids.GetNumberOfIds() - 1):
+            segs.append(block.GetPoint(ids.GetId(j)) + block.GetPoint(ids.GetId(j + 1)))
+segs = np.array(segs, dtype=np.float64).reshape(-1, 6)
+
+out = self.GetTableOutput()
+for k, name in enumerate(["x0", "y0", "z0", "x1", "y1", "z1"]):
+    arr = numpy_support.numpy_to_vtk(np.ascontiguousarray(segs[:, k]), deep=1)
+    arr.SetName(name)
+    out.AddColumn(arr)
+"""
+
 # ----------------------------------------------------------------
 # save data
 # ----------------------------------------------------------------
-SaveData(
-    oname,
+save_options = dict(
     proxy=saveinput,
     Precision=5,
     UseScientificNotation=0,
     WriteTimeSteps=1,
     FieldAssociation="Points",
 )
+if args.compress is None:
+    with profiling.stage("extract", folder=fdir):
+        SaveData(oname, **save_options)
+
+else:
+    # write one time step at a time and compress its files (one per
+    # rank) right away so that the uncompressed slices never pile up
+    times = exoreader.TimestepValues
+    if not isinstance(times, (list, tuple)):
+        times = [times]
+    for step in range(len(times)):
+        with profiling.stage("extract", folder=fdir, step=step):
+            SaveData(oname, FrameWindow=[step, step], **save_options)
+        with profiling.stage("compress", folder=fdir, step=step):
+            for fname in glob.glob(os.path.join(odir, "output*.csv")):
+                utilities.compress_file(fname, args.compress)
+
+# the mesh does not move so the connectivity of the first time step is enough
+SaveData(sname, proxy=segments1, Precision=5, UseScientificNotation=0)
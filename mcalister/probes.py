@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+#
+# Spatial queries (point and line probes) on averaged slice data
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import pickle
+import argparse
+import numpy as np
+from mcalister import utilities
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def build_slice_trees(df, slice_col, plane_cols, decimals=5):
+    """Build a KD-tree of the in-plane coordinates of each slice
+
+    Returns a dictionary keyed on the (rounded) slice location
+    containing the tree and the rows of the dataframe in that slice.
+    """
+    import scipy.spatial as sps
+
+    keys = np.round(df[slice_col].values, decimals)
+    pts = df[plane_cols].values
+    trees = {}
+    for key in np.unique(keys):
+        rows = np.flatnonzero(keys == key)
+        trees[key] = (sps.cKDTree(pts[rows]), rows)
+    return trees
+
+
+# ========================================================================
+def get_slice_trees(fname, df, slice_col, plane_cols, decimals=5):
+    """Return the slice KD-trees, loading them from disk if possible
+
+    The trees are cached next to the slice file and rebuilt when the
+    file or the columns used change.
+    """
+    cname = os.path.splitext(fname)[0] + ".kdtree.pkl"
+    signature = (
+        os.path.getsize(fname),
+        os.path.getmtime(fname),
+        slice_col,
+        tuple(plane_cols),
+        decimals,
+        len(df),
+    )
+    try:
+        with open(cname, "rb") as f:
+            cached = pickle.load(f)
+        if cached["signature"] == signature:
+            return cached["trees"]
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError):
+        pass
+
+    trees = build_slice_trees(df, slice_col, plane_cols, decimals)
+    with open(cname, "wb") as f:
+        pickle.dump({"signature": signature, "trees": trees}, f)
+    return trees
+
+
+# ========================================================================
+def interpolate(tree, values, points, k=8, method="linear"):
+    """Interpolate values at points from their k nearest neighbors
+
+    method is either "nearest", "idw" (inverse distance weighting) or
+    "linear" (local least squares plane fit).
+    """
+    points = np.atleast_2d(points)
+    k = min(k, tree.n)
+    if method == "nearest" or k == 1:
+        _, idx = tree.query(points)
+        return values[idx]
+
+    dist, idx = tree.query(points, k=k)
+    if method == "idw":
+        weights = 1.0 / np.maximum(dist, 1e-12) ** 2
+        weights /= weights.sum(axis=1, keepdims=True)
+        return np.einsum("mk,mkf->mf", weights, values[idx])
+
+    elif method == "linear":
+        # local coordinates to keep the fit well conditioned
+        dx = tree.data[idx] - points[:, None, :]
+        design = np.concatenate((np.ones(dx.shape[:2] + (1,)), dx), axis=2)
+        coefs = np.linalg.pinv(design) @ values[idx]
+        return coefs[:, 0, :]
+
+    else:
+        raise ValueError(f"Unknown interpolation method {method}")
+
+
+# ========================================================================
+def probe_points(trees, df, fields, slices, points, decimals=5, **kwargs):
+    """Probe fields at in-plane points on the given slices
+
+    slices is either a single slice location or one per point.
+    """
+    import pandas as pd
+
+    points = np.atleast_2d(points)
+    keys = np.broadcast_to(np.round(slices, decimals), (points.shape[0],))
+    available = np.array(sorted(trees))
+    values = df[fields].values
+    result = np.full((points.shape[0], len(fields)), np.nan)
+    for key in np.unique(keys):
+        # closest slice, allowing for round off in the slice locations
+        closest = available[np.argmin(np.fabs(available - key))]
+        if np.fabs(closest - key) > 1.5 * 10 ** (-decimals):
+            raise KeyError(f"No slice at {key}")
+        tree, rows = trees[closest]
+        sel = keys == key
+        result[sel] = interpolate(tree, values[rows], points[sel], **kwargs)
+    return pd.DataFrame(result, columns=fields)
+
+
+# ========================================================================
+def probe_line(trees, df, fields, slice_value, start, end, npts, **kwargs):
+    """Probe fields along a line on a slice"""
+    points = np.linspace(start, end, npts)
+    return probe_points(trees, df, fields, slice_value, points, **kwargs)
+
+
+# ========================================================================
+def decimate(points, npts, keep=None, maxiter=10):
+    """Spatially stratified subsample of about npts points (indices)
+
+    The bounding box is binned in cells of equal size and the point
+    closest to the center of each non-empty cell is kept. The cell size
+    is adjusted until the number of non-empty cells is close to npts.
+    The points in keep (indices) are always part of the subsample.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1:
+        points = points[:, None]
+    if len(points) <= npts:
+        return np.arange(len(points))
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    active = hi > lo
+    points, lo, span = points[:, active], lo[active], (hi - lo)[active]
+    dim = points.shape[1]
+    if dim == 0:
+        # all the points are at the same location
+        best = np.arange(npts)
+        return np.sort(best if keep is None else np.union1d(best, keep))
+
+    ncells = float(npts)
+    best = None
+    for _ in range(maxiter):
+        h = (np.prod(span) / ncells) ** (1.0 / dim)
+        cells = np.floor((points - lo) / h).astype(np.int64)
+        keys = np.ravel_multi_index(cells.T, cells.max(axis=0) + 1)
+        dist = np.linalg.norm(points - (lo + (cells + 0.5) * h), axis=1)
+        order = np.lexsort((dist, keys))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[order][1:] != keys[order][:-1]
+        idx = order[first]
+        if best is None or abs(len(idx) - npts) < abs(len(best) - npts):
+            best = idx
+        if abs(len(idx) - npts) <= 0.05 * npts:
+            break
+        ncells *= npts / len(idx)
+
+    if keep is not None:
+        best = np.union1d(best, keep)
+    return np.sort(best)
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Probe averaged slice data"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Probe averaged slice data")
+    parser.add_argument(
+        "-f", "--fname", help="Averaged slice file", type=str, required=True
+    )
+    parser.add_argument(
+        "-p", "--probes", help="CSV file of probe locations", type=str, required=True
+    )
+    parser.add_argument(
+        "--slice", help="Column defining the slices", type=str, default="z"
+    )
+    parser.add_argument(
+        "--plane", help="In-plane columns", nargs=2, type=str, default=["x", "y"]
+    )
+    parser.add_argument(
+        "--fields", help="Fields to probe", nargs="+", type=str, default=["p"]
+    )
+    parser.add_argument(
+        "-m",
+        "--method",
+        help="Interpolation method",
+        type=str,
+        default="linear",
+        choices=["nearest", "idw", "linear"],
+    )
+    parser.add_argument(
+        "-o", "--output", help="Output file", type=str, default="probes.csv"
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import pandas as pd
+
+    with profiling.stage("read") as info:
+        df = pd.read_csv(args.fname).rename(columns=utilities.get_renames())
+        probes = pd.read_csv(args.probes)
+        info["rows"] = len(df)
+    with profiling.stage("kdtree"):
+        trees = get_slice_trees(args.fname, df, args.slice, args.plane)
+    with profiling.stage("probe") as info:
+        result = probe_points(
+            trees,
+            df,
+            args.fields,
+            probes[args.slice].values,
+            probes[args.plane].values,
+            method=args.method,
+        )
+        info["rows"] = len(result)
+    pd.concat([probes, result], axis=1).to_csv(args.output, index=False)
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import resource
+import threading
+import contextlib
+
+# ========================================================================
+#
+# Some defaults variables
+#
+# ========================================================================
+_config = {"trace": None, "cprofile": set()}
+_events = []
+_start = time.perf_counter()
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def add_arguments(parser):
+    """Add the profiling arguments to a script parser
+
+    The defaults can also be set with the MCALISTER_PROFILE (trace
+    file) and MCALISTER_CPROFILE (comma separated stage names)
+    environment variables.
+    """
+    parser.add_argument(
+        "--profile",
+        help="Write a timeline of the stages (Chrome trace format) to this file",
+        type=str,
+        default=os.environ.get("MCALISTER_PROFILE"),
+    )
+    parser.add_argument(
+        "--cprofile",
+        help="Stages to run under cProfile",
+        nargs="+",
+        type=str,
+        default=[s for s in os.environ.get("MCALISTER_CPROFILE", "").split(",") if s],
+    )
+
+
+# ========================================================================
+def setup(args):
+    """Enable the profiling requested in the parsed arguments"""
+    if args.profile is None:
+        return
+    _config["trace"] = os.path.abspath(args.profile)
+    _config["cprofile"] = set(args.cprofile)
+    atexit.register(write)
+
+
+# ========================================================================
+def get_worker_config():
+    """Profiling configuration to pass to init_worker"""
+    return {
+        "trace": _config["trace"],
+        "cprofile": sorted(_config["cprofile"]),
+        "start": _start,
+    }
+
+
+# ========================================================================
+def init_worker(config):
+    """Enable the profiling of the parent in a worker process
+
+    To be used as the initializer of a multiprocessing pool, with the
+    configuration given by get_worker_config in the parent. The stages
+    of the worker are returned to the parent with collect.
+    """
+    global _start
+    _config["trace"] = config["trace"]
+    _config["cprofile"] = set(config["cprofile"])
+    _start = config["start"]
+    # a forked worker starts with a copy of the stages of the parent
+    del _events[:]
+
+
+# ========================================================================
+def collect(function, *args):
+    """Call a function in a worker process and return its result with
+    the stages it recorded (to be given to merge in the parent)"""
+    first = len(_events)
+    result = function(*args)
+    return result, _events[first:]
+
+
+# ========================================================================
+def merge(events):
+    """Add the stages recorded in a worker process to the timeline"""
+    _events.extend(events)
+
+
+# ========================================================================
+def get_max_rss():
+    """High-water mark of the resident set size of the process in MB"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+
+
+# ========================================================================
+def get_rss():
+    """Current resident set size of the process in MB (None if it
+    cannot be read)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+# ========================================================================
+@contextlib.contextmanager
+def stage(name, **tags):
+    """Time a named stage of a script
+
+    The yielded dictionary can be used to record extra information
+    about the stage (e.g. the number of rows read). The resident set
+    size is recorded at the start and end of the stage (rss_start_mb,
+    rss_end_mb) with the high-water mark of the process so far
+    (process_max_rss_mb), which is not specific to the stage. Nothing is
+    recorded unless profiling was enabled.
+    """
+    info = dict(tags)
+    if _config["trace"] is None:
+        yield info
+        return
+
+    profiler = cProfile.Profile() if name in _config["cprofile"] else None
+    rss = get_rss()
+    wall, cpu = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield info
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        end = time.perf_counter()
+        info.update(
+            {
+                "wall_time": end - wall,
+                "cpu_time": time.process_time() - cpu,
+                "rss_start_mb": rss,
+                "rss_end_mb": get_rss(),
+                "process_max_rss_mb": get_max_rss(),
+            }
+        )
+        if profiler is not None:
+            base = os.path.splitext(_config["trace"])[0]
+            pname = f"{base}_{name}_{os.getpid()}_{len(_events)}.prof"
+            profiler.dump_stats(pname)
+            info["cprofile"] = pname
+        _events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (wall - _start) * 1e6,
+                "dur": (end - wall) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": info,
+            }
+        )
+
+
+# ========================================================================
+def write():
+    """Write the timeline and a per stage summary"""
+    summary = {}
+    for event in _events:
+        s = summary.setdefault(
+            event["name"], {"count": 0, "wall_time": 0.0, "cpu_time": 0.0}
+        )
+        s["count"] += 1
+        s["wall_time"] += event["args"]["wall_time"]
+        s["cpu_time"] += event["args"]["cpu_time"]
+
+    with open(_config["trace"], "w") as f:
+        json.dump(
+            {
+                "traceEvents": _events,
+                "displayTimeUnit": "ms",
+                "command": " ".join(sys.argv),
+                "max_rss_mb": get_max_rss(),
+                "stages": summary,
+            },
+            f,
+            indent=1,
+            default=str,
+        )
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+#
+# This ingests the results of many runs (metadata, converged forces,
+# averaged wing and vortex slices, vortex cores) in an indexed database
+# so that the whole campaign can be queried without reading the run
+# folders. The run metadata and the scalar results are stored in an
+# SQLite file and the slice data in one npz file (one array per column)
+# per run and kind, which the plot scripts use directly.
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import numpy as np
+from mcalister import utilities
+from mcalister import definitions as defs
+from mcalister import plot_data
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Some defaults variables
+#
+# ========================================================================
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    campaign TEXT,
+    name TEXT,
+    dim INTEGER,
+    aoa REAL,
+    overset INTEGER,
+    mesh TEXT,
+    time_step REAL,
+    nsteps INTEGER,
+    output_frequency INTEGER,
+    umag REAL,
+    rho REAL,
+    mu REAL,
+    signature TEXT,
+    ingested REAL
+);
+CREATE INDEX IF NOT EXISTS runs_aoa ON runs (aoa, dim);
+CREATE TABLE IF NOT EXISTS forces (
+    run_id INTEGER PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE,
+    t_start REAL,
+    t_end REAL,
+    cl REAL,
+    cd REAL,
+    cl_std REAL,
+    cd_std REAL
+);
+CREATE TABLE IF NOT EXISTS slices (
+    run_id INTEGER REFERENCES runs (id) ON DELETE CASCADE,
+    kind TEXT,
+    k INTEGER,
+    location REAL,
+    npts INTEGER,
+    PRIMARY KEY (run_id, kind, k)
+);
+CREATE INDEX IF NOT EXISTS slices_location ON slices (kind, location);
+CREATE TABLE IF NOT EXISTS cores (
+    run_id INTEGER REFERENCES runs (id) ON DELETE CASCADE,
+    k INTEGER,
+    x REAL,
+    yc REAL,
+    zc REAL,
+    pc REAL,
+    omega_core REAL,
+    omega_max REAL,
+    q_max REAL,
+    gamma REAL,
+    PRIMARY KEY (run_id, k)
+);
+"""
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def connect(dbname):
+    """Open (and create if needed) a results database"""
+    con = sqlite3.connect(dbname)
+    con.execute("PRAGMA foreign_keys = ON")
+    con.executescript(schema)
+    return con
+
+
+# ========================================================================
+def get_data_file(dbname, run_id, kind):
+    """Slice data file of a run (kind is wing or vortex)"""
+    ddir = os.path.splitext(os.path.abspath(dbname))[0] + "_data"
+    return os.path.join(ddir, f"run_{run_id}", f"{kind}.npz")
+
+
+# ========================================================================
+def get_run_id(con, fdir):
+    """Id of the run of a folder, None if it was not ingested"""
+    row = con.execute(
+        "SELECT id FROM runs WHERE path = ?", (os.path.abspath(fdir),)
+    ).fetchone()
+    return None if row is None else row[0]
+
+
+# ========================================================================
+def get_run_data(con, dbname, fdir, kind):
+    """Slice data (dictionary of arrays) and metadata (row of the runs
+    table) of a folder, None if it was not ingested
+
+    Only the database files are read, the run folder may have been
+    moved or deleted since the ingestion.
+    """
+    cur = con.execute("SELECT * FROM runs WHERE path = ?", (os.path.abspath(fdir),))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    meta = dict(zip([col[0] for col in cur.description], row))
+    cname = get_data_file(dbname, meta["id"], kind)
+    if not os.path.exists(cname):
+        return None
+    with np.load(cname, allow_pickle=False) as dat:
+        data = {key: dat[key] for key in dat.files if key != "signature"}
+    return data, meta
+
+
+# ========================================================================
+def get_metadata(fdir):
+    """Metadata of a run from its input file"""
+    import yaml
+
+    yname = os.path.join(fdir, "mcalister.yaml")
+    with open(yname, "r") as stream:
+        dat = yaml.safe_load(stream)
+    ti = dat["Time_Integrators"][0]["StandardTimeIntegrator"]
+    realm = dat["realms"][0]
+    u0, v0, w0, umag0, rho0, mu = utilities.parse_ic(yname)
+    return {
+        "path": os.path.abspath(fdir),
+        "campaign": os.path.basename(os.path.dirname(os.path.abspath(fdir))),
+        "name": os.path.basename(os.path.abspath(fdir)),
+        "dim": defs.get_dimension(yname),
+        "aoa": defs.get_aoa(os.path.basename(os.path.abspath(fdir))),
+        "overset": int(defs.get_is_overset(yname)),
+        "mesh": realm["mesh"],
+        "time_step": float(ti["time_step"]),
+        "nsteps": int(ti.get("termination_step_count", 0)),
+        "output_frequency": int(realm.get("output", {}).get("output_frequency", 0)),
+        "umag": umag0,
+        "rho": rho0,
+        "mu": mu,
+    }
+
+
+# ========================================================================
+def get_converged_forces(fdir, meta, fraction=0.25):
+    """Mean and standard deviation of cl and cd over the last fraction
+    of the time history"""
+    df = utilities.get_forces(fdir)
+    df = df[df.Time >= df.Time.max() - fraction * (df.Time.max() - df.Time.min())]
+    area = defs.get_wing_area(meta["dim"])
+    dynPres = meta["rho"] * 0.5 * (meta["umag"] ** 2)
+    alpha = np.radians(meta["aoa"])
+    c, s = np.cos(alpha), np.sin(alpha)
+    cl = ((df.Fpy + df.Fvy) * c - (df.Fpx + df.Fvx) * s) / (dynPres * area)
+    cd = ((df.Fpy + df.Fvy) * s + (df.Fpx + df.Fvx) * c) / (dynPres * area)
+    return {
+        "t_start": df.Time.min(),
+        "t_end": df.Time.max(),
+        "cl": cl.mean(),
+        "cd": cd.mean(),
+        "cl_std": cl.std(),
+        "cd_std": cd.std(),
+    }
+
+
+# ========================================================================
+def ingest(con, dbname, fdir, fraction=0.25, force=False):
+    """Add or update a run in the database
+
+    Nothing is done when the input file, the forces and the averaged
+    slices did not change since the last ingestion. Returns the id of
+    the run and whether it was updated.
+    """
+    from mcalister import plot_wing
+    from mcalister import plot_vortex
+
+    fdir = os.path.abspath(fdir)
+    fnames = [
+        os.path.join(fdir, "mcalister.yaml"),
+        os.path.join(fdir, "wing_slices", "avg_slice.csv"),
+        os.path.join(fdir, "wing_slices", "segments.csv"),
+        os.path.join(fdir, "vortex_slices", "avg_slice.csv"),
+    ]
+    forces_files = utilities.get_forces_files(fdir)
+    signature = plot_data.get_signature(
+        fnames,
+        fraction=fraction,
+        forces=utilities.get_forces_signature(forces_files).tolist(),
+    )
+    row = con.execute(
+        "SELECT id, signature FROM runs WHERE path = ?", (fdir,)
+    ).fetchone()
+    if row is not None and row[1] == signature and not force:
+        return row[0], False
+
+    meta = get_metadata(fdir)
+    meta["signature"] = signature
+    meta["ingested"] = time.time()
+    cols = list(meta)
+    with con:
+        con.execute(
+            f"INSERT INTO runs ({', '.join(cols)})"
+            f" VALUES ({', '.join('?' * len(cols))})"
+            f" ON CONFLICT (path) DO UPDATE SET"
+            f" {', '.join(f'{c} = excluded.{c}' for c in cols)}",
+            [meta[c] for c in cols],
+        )
+        run_id = get_run_id(con, fdir)
+        for table in ["forces", "slices", "cores"]:
+            con.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+        # Converged lift and drag
+        if forces_files:
+            with profiling.stage("forces", folder=fdir):
+                forces = get_converged_forces(fdir, meta, fraction)
+            con.execute(
+                "INSERT INTO forces VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [run_id] + list(forces.values()),
+            )
+
+        # Wing slices
+        if os.path.exists(fnames[1]):
+            cname = get_data_file(dbname, run_id, "wing")
+            os.makedirs(os.path.dirname(cname), exist_ok=True)
+            data, zslices, label = plot_wing.get_case_data(fdir, cname=cname)
+            con.executemany(
+                "INSERT INTO slices VALUES (?, 'wing', ?, ?, ?)",
+                [
+                    (run_id, k, round(zs, 3), len(data[f"x_{k}"]))
+                    for k, zs in enumerate(zslices.zslicen)
+                    if f"x_{k}" in data
+                ],
+            )
+
+        # Vortex slices and cores
+        if os.path.exists(fnames[3]):
+            cname = get_data_file(dbname, run_id, "vortex")
+            os.makedirs(os.path.dirname(cname), exist_ok=True)
+            xslices = utilities.get_vortex_slices()
+            xslices["xslicet"] = xslices.xslice + 1
+            data, label = plot_vortex.get_case_data(fdir, xslices, cname=cname)
+            ks = [k for k in range(len(xslices)) if f"core_{k}" in data]
+            con.executemany(
+                "INSERT INTO slices VALUES (?, 'vortex', ?, ?, ?)",
+                [(run_id, k, xslices.xslicet[k], len(data[f"z_{k}"])) for k in ks],
+            )
+            con.executemany(
+                "INSERT INTO cores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    [run_id, k]
+                    + data[f"core_{k}"].tolist()
+                    + data[f"vort_{k}"].tolist()
+                    + [data[f"gamma_{k}"][-1]]
+                    for k in ks
+                ],
+            )
+    return run_id, True
+
+
+# ========================================================================
+def get_condition(where):
+    """SQL condition of a query from a user condition (None for all rows)
+
+    The condition (e.g. "aoa = 12") is raw SQL on the columns of the
+    tables and is pasted in the query: values can be given as ?
+    placeholders bound to the query parameters. Only one expression is
+    accepted and the queries run with read access only (see select).
+    """
+    if where is None:
+        return "1"
+    if ";" in where:
+        raise ValueError(f"Invalid SQL condition {where!r}: one expression only")
+    return f"({where})"
+
+
+# ========================================================================
+def read_only(action, *args):
+    """SQLite authorizer denying everything but reading"""
+    allowed = [sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION]
+    return sqlite3.SQLITE_OK if action in allowed else sqlite3.SQLITE_DENY
+
+
+# ========================================================================
+def select(con, query, params=()):
+    """Dataframe of the rows of a query run with read access only"""
+    import pandas as pd
+
+    con.set_authorizer(read_only)
+    try:
+        cur = con.execute(query, params)
+        rows = cur.fetchall()
+    finally:
+        con.set_authorizer(lambda *args: sqlite3.SQLITE_OK)
+    return pd.DataFrame(rows, columns=[col[0] for col in cur.description])
+
+
+# ========================================================================
+def get_runs(con, where=None, params=()):
+    """Runs (with their converged forces) matching an SQL condition on
+    the columns of the runs table (see get_condition)"""
+    query = (
+        "SELECT runs.*, forces.cl, forces.cd, forces.cl_std, forces.cd_std"
+        " FROM runs LEFT JOIN forces ON forces.run_id = runs.id"
+        f" WHERE {get_condition(where)} ORDER BY runs.path"
+    )
+    return select(con, query, params)
+
+
+# ========================================================================
+def get_slice_data(
+    con, dbname, kind, location, fields, where=None, params=(), tol=1e-3
+):
+    """Arrays of a slice of every run matching an SQL condition (see
+    get_condition)
+
+    location is z/s for the wing and x/c for the vortex slices. Returns
+    a list of (path, dictionary of arrays) with the arrays of fields
+    (e.g. x and cp for the wing).
+    """
+    query = (
+        "SELECT runs.id, runs.path, slices.k FROM slices"
+        " JOIN runs ON runs.id = slices.run_id"
+        " WHERE slices.kind = ? AND slices.location BETWEEN ? AND ?"
+        f" AND {get_condition(where)} ORDER BY runs.path"
+    )
+    rows = select(con, query, (kind, location - tol, location + tol) + tuple(params))
+    lst = []
+    for run_id, path, k in rows.itertuples(index=False):
+        with np.load(get_data_file(dbname, run_id, kind)) as dat:
+            lst.append(
+                (path, {f: dat[f"{f}_{k}"] for f in fields if f"{f}_{k}" in dat.files})
+            )
+    return lst
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Ingest runs in and query the results database"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Database of the campaign results")
+    parser.add_argument(
+        "-d", "--db", help="Database file", type=str, default="results.db"
+    )
+    parser.add_argument(
+        "-f", "--folders", nargs="+", help="Folders to ingest", type=str, default=[]
+    )
+    parser.add_argument(
+        "--fraction",
+        help="Fraction of the time history of the converged forces",
+        type=float,
+        default=0.25,
+    )
+    parser.add_argument(
+        "--force", help="Ingest even if the inputs did not change", action="store_true"
+    )
+    parser.add_argument(
+        "-w", "--where", help="SQL condition on the runs (e.g. 'aoa = 12')", type=str
+    )
+    parser.add_argument(
+        "--cp", help="Print the cp on the wing slice at z/s", type=float
+    )
+    parser.add_argument("--cores", help="Print the vortex cores", action="store_true")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    con = connect(args.db)
+    for folder in args.folders:
+        try:
+            with profiling.stage("ingest", folder=folder):
+                run_id, updated = ingest(
+                    con, args.db, folder, args.fraction, args.force
+                )
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"Skipping {folder}: {exc}", file=sys.stderr)
+            continue
+        print(f"{'Ingested' if updated else 'Up to date'}: {folder} (run {run_id})")
+
+    try:
+        get_condition(args.where)
+    except ValueError as exc:
+        parser.error(str(exc))
+    with profiling.stage("query"):
+        runs = get_runs(con, args.where)
+    cols = ["id", "campaign", "name", "dim", "aoa", "mesh", "cl", "cd"]
+    print(runs[cols].to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+
+    if args.cp is not None:
+        with profiling.stage("query"):
+            lst = get_slice_data(con, args.db, "wing", args.cp, ["x", "cp"], args.where)
+        print(f"cp at z/s={args.cp}")
+        for path, data in lst:
+            print(
+                f"{path}: {len(data['x'])} points,"
+                f" min cp {np.min(data['cp']):.4g}, max cp {np.max(data['cp']):.4g}"
+            )
+
+    if args.cores:
+        query = (
+            "SELECT runs.path, cores.* FROM cores"
+            " JOIN runs ON runs.id = cores.run_id"
+            f" WHERE {get_condition(args.where)} ORDER BY runs.path, cores.k"
+        )
+        cores = select(con, query)
+        print(cores.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+    con.close()
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
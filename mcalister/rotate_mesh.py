@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+#
+# This rotates mesh blocks of an Exodus mesh for a list of angles (same
+# inputs as the rotate_mesh task of nalu_preprocess)
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import shutil
+import argparse
+import numpy as np
+from mcalister import exodus
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_rotation_matrix(angle, axis):
+    """Rotation matrix for an angle (degrees) about an axis (right hand rule)"""
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    theta = np.radians(angle)
+    k = np.array(
+        [[0, -axis[2], axis[1]], [axis[2], 0, -axis[0]], [-axis[1], axis[0], 0]]
+    )
+    return np.eye(3) + np.sin(theta) * k + (1 - np.cos(theta)) * k @ k
+
+
+# ========================================================================
+def get_block_nodes(f, parts):
+    """Indices (0-based) of the nodes of the named blocks"""
+    parts = [p.lower() for p in parts]
+    names = [n.lower() for n in exodus.get_block_names(f)]
+    missing = [p for p in parts if p not in names]
+    if len(missing) > 0:
+        raise KeyError(f"Blocks {missing} not in mesh (blocks are {names})")
+    nodes = [
+        np.asarray(f.variables[f"connect{names.index(p) + 1}"][:]).ravel()
+        for p in parts
+    ]
+    return np.unique(np.concatenate(nodes)) - 1
+
+
+# ========================================================================
+def get_coordinate_layout(fname):
+    """File offset, dtype and shape of each coordinate array"""
+    layout = exodus.get_variable_layout(fname)
+    if "coord" in layout:
+        return [layout["coord"]]
+    return [layout[n] for n in ["coordx", "coordy", "coordz"] if n in layout]
+
+
+# ========================================================================
+def rotate_mesh(iname, onames, angles, parts, origin, axis):
+    """Write a rotated copy of a mesh for each angle
+
+    Each output is a byte copy of the input in which only the
+    coordinates of the nodes in the rotated blocks are overwritten.
+    """
+    with exodus.open_exodus(iname) as f:
+        nodes = get_block_nodes(f, parts)
+        coords = np.array(exodus.get_coordinates(f), dtype=np.float64)[nodes]
+
+    layout = get_coordinate_layout(iname)
+    origin = np.asarray(origin, dtype=np.float64)[: coords.shape[1]]
+    pts = coords - origin
+    for angle, oname in zip(angles, onames):
+        rot = get_rotation_matrix(angle, axis)[: coords.shape[1], : coords.shape[1]]
+        new = pts @ rot.T + origin
+
+        shutil.copyfile(iname, oname)
+        if len(layout) == 1:
+            offset, dtype, shape = layout[0]
+            mm = np.memmap(oname, dtype=dtype, mode="r+", offset=offset, shape=shape)
+            mm[:, nodes] = new.T
+            mm.flush()
+            del mm
+        else:
+            for k, (offset, dtype, shape) in enumerate(layout):
+                mm = np.memmap(
+                    oname, dtype=dtype, mode="r+", offset=offset, shape=shape
+                )
+                mm[nodes] = new[:, k]
+                mm.flush()
+                del mm
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Rotate mesh blocks"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Rotate mesh blocks")
+    parser.add_argument(
+        "-i",
+        "--input",
+        help="nalu_preprocess input file",
+        type=str,
+        default="meshes/rotate_mesh.yaml",
+    )
+    parser.add_argument(
+        "-a",
+        "--angles",
+        help="Rotation angles in degrees (defaults to the input file angle)",
+        nargs="+",
+        type=float,
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import yaml
+
+    # Setup
+    iname = os.path.abspath(args.input)
+    mdir = os.path.dirname(iname)
+    with open(iname, "r") as stream:
+        dat = yaml.safe_load(stream)["nalu_preprocess"]
+    opts = dat["rotate_mesh"]
+    angles = args.angles if args.angles else [float(opts["angle"])]
+    input_db = os.path.join(mdir, dat["input_db"])
+    if args.angles:
+        base, ext = os.path.splitext(input_db)
+        onames = [f"{base}_{angle:g}{ext}" for angle in angles]
+    else:
+        onames = [os.path.join(mdir, dat["output_db"])]
+
+    with profiling.stage("rotate", mesh=input_db) as info:
+        rotate_mesh(
+            input_db, onames, angles, opts["mesh_parts"], opts["origin"], opts["axis"]
+        )
+        info["rows"] = len(angles)
+    for angle, oname in zip(angles, onames):
+        print(f"{angle:g} degrees: {oname}")
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+#
+# This computes Welch power spectral densities and Strouhal numbers of
+# the lift and drag coefficients and of point probes in the per-step
+# slices. The spectra are accumulated segment by segment and the
+# accumulator is saved so that later calls only process the new data.
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import argparse
+import numpy as np
+from mcalister import utilities
+from mcalister import definitions as defs
+from mcalister import manifest
+from mcalister import probes
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def init_welch(names, nperseg, dt, overlap=0.5):
+    """Empty Welch accumulator for the variables in names
+
+    Samples are interpolated on a uniform grid of spacing dt. The
+    accumulator holds the sum of the periodograms of the completed
+    segments and only the samples of the segment in progress.
+    """
+    nvars = len(names)
+    return {
+        "names": np.array(names, dtype=str),
+        "nperseg": int(nperseg),
+        "noverlap": int(nperseg * overlap),
+        "dt": float(dt),
+        "t_next": np.nan,
+        "t_last": np.nan,
+        "v_last": np.full(nvars, np.nan),
+        "buffer": np.zeros((0, nvars)),
+        "psd_sum": np.zeros((int(nperseg) // 2 + 1, nvars)),
+        "nseg": 0,
+    }
+
+
+# ========================================================================
+def get_window(nperseg):
+    """Periodic Hann window"""
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(nperseg) / nperseg)
+
+
+# ========================================================================
+def update_welch(state, times, values):
+    """Add samples (times increasing) to a Welch accumulator
+
+    Samples at or before the last sample already added are ignored so
+    that the same history can be fed again after it has grown.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(len(times), -1)
+    if not np.isnan(state["t_last"]):
+        keep = times > state["t_last"]
+        times, values = times[keep], values[keep]
+    if len(times) == 0:
+        return state
+
+    # Resample on the uniform grid
+    if np.isnan(state["t_next"]):
+        state["t_next"] = times[0]
+    else:
+        times = np.concatenate(([state["t_last"]], times))
+        values = np.vstack((state["v_last"], values))
+    dt = state["dt"]
+    n = int(np.floor((times[-1] - state["t_next"]) / dt + 1e-9)) + 1
+    if n > 0:
+        grid = state["t_next"] + dt * np.arange(n)
+        samples = np.column_stack(
+            [np.interp(grid, times, values[:, j]) for j in range(values.shape[1])]
+        )
+        state["t_next"] = state["t_next"] + n * dt
+        state["buffer"] = np.vstack((state["buffer"], samples))
+    state["t_last"] = times[-1]
+    state["v_last"] = values[-1]
+
+    # Periodograms of the completed segments
+    nperseg = int(state["nperseg"])
+    step = nperseg - int(state["noverlap"])
+    window = get_window(nperseg)[:, None]
+    buf = state["buffer"]
+    start = 0
+    while len(buf) - start >= nperseg:
+        seg = buf[start : start + nperseg]
+        seg = (seg - seg.mean(axis=0)) * window
+        state["psd_sum"] += np.abs(np.fft.rfft(seg, axis=0)) ** 2
+        state["nseg"] += 1
+        start += step
+    state["buffer"] = buf[start:].copy()
+    return state
+
+
+# ========================================================================
+def get_psd(state):
+    """Frequencies and one-sided power spectral densities (one column
+    per variable) of the completed segments"""
+    nperseg = int(state["nperseg"])
+    dt = float(state["dt"])
+    freqs = np.fft.rfftfreq(nperseg, dt)
+    if state["nseg"] == 0:
+        return freqs, np.full(state["psd_sum"].shape, np.nan)
+    window = get_window(nperseg)
+    psd = state["psd_sum"] / state["nseg"] * dt / np.sum(window ** 2)
+    last = None if nperseg % 2 else -1
+    psd[1:last] *= 2
+    return freqs, psd
+
+
+# ========================================================================
+def get_strouhal(freqs, psd, length, velocity):
+    """Frequency and Strouhal number of the peak (excluding the mean) of
+    each spectrum"""
+    idx = np.nanargmax(psd[1:], axis=0) + 1
+    return freqs[idx], freqs[idx] * length / velocity
+
+
+# ========================================================================
+def load_welch(fname, names, nperseg, dt, overlap=0.5):
+    """Load a saved accumulator, a new one if missing or the settings
+    differ"""
+    try:
+        with np.load(fname, allow_pickle=False) as dat:
+            state = {key: dat[key] for key in dat.files}
+        state["nseg"] = int(state["nseg"])
+        for key in ["nperseg", "noverlap"]:
+            state[key] = int(state[key])
+        for key in ["dt", "t_next", "t_last"]:
+            state[key] = float(state[key])
+        if (
+            list(state["names"]) == list(names)
+            and state["nperseg"] == nperseg
+            and state["noverlap"] == int(nperseg * overlap)
+            and np.isclose(state["dt"], dt)
+        ):
+            return state
+    except (OSError, KeyError, ValueError):
+        pass
+    return init_welch(names, nperseg, dt, overlap)
+
+
+# ========================================================================
+def save_welch(fname, state):
+    """Save an accumulator"""
+    np.savez(fname, **state)
+
+
+# ========================================================================
+def write_spectra(fname, state, length, velocity):
+    """Write the spectra and return the peak frequencies"""
+    import pandas as pd
+
+    freqs, psd = get_psd(state)
+    df = pd.DataFrame(psd, columns=state["names"])
+    df.insert(0, "St", freqs * length / velocity)
+    df.insert(0, "frequency", freqs)
+    df.to_csv(fname, index=False)
+    if state["nseg"] == 0:
+        return None
+    fpeak, stpeak = get_strouhal(freqs, psd, length, velocity)
+    return pd.DataFrame({"variable": state["names"], "frequency": fpeak, "St": stpeak})
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Spectra and Strouhal numbers of the forces and probes"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="Spectra and Strouhal numbers of forces and probes"
+    )
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-n", "--nperseg", help="Samples per Welch segment", type=int, default=512
+    )
+    parser.add_argument(
+        "--dt", help="Sampling interval (default: median force time step)", type=float
+    )
+    parser.add_argument(
+        "-l",
+        "--length",
+        help="Length scale of the Strouhal number",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument("-p", "--probes", help="CSV file of probe locations", type=str)
+    parser.add_argument(
+        "--slices",
+        help="Folder of the per-step slices",
+        type=str,
+        default="wing_slices",
+    )
+    parser.add_argument(
+        "--slice", help="Column defining the slices", type=str, default="z"
+    )
+    parser.add_argument(
+        "--plane", help="In-plane columns", nargs=2, type=str, default=["x", "y"]
+    )
+    parser.add_argument(
+        "--fields", help="Fields to probe", nargs="+", type=str, default=["p"]
+    )
+    parser.add_argument(
+        "-r", "--reset", help="Start the accumulation over", action="store_true"
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import pandas as pd
+
+    # Setup
+    fdir = os.path.abspath(args.folder)
+    yname = os.path.join(fdir, "mcalister.yaml")
+    dim = defs.get_dimension(yname)
+    area = defs.get_wing_area(dim)
+    u0, v0, w0, umag0, rho0, mu = utilities.parse_ic(yname)
+    dynPres = rho0 * 0.5 * (umag0 ** 2)
+    aoa = defs.get_aoa(fdir)
+
+    # Lift and drag
+    with profiling.stage("read", folder=fdir) as info:
+        df = utilities.get_forces(fdir)
+        info["rows"] = len(df)
+    alpha = np.radians(aoa)
+    c, s = np.cos(alpha), np.sin(alpha)
+    df["cl"] = ((df.Fpy + df.Fvy) * c - (df.Fpx + df.Fvx) * s) / (dynPres * area)
+    df["cd"] = ((df.Fpy + df.Fvy) * s + (df.Fpx + df.Fvx) * c) / (dynPres * area)
+    dt = args.dt if args.dt is not None else np.median(np.diff(df.Time))
+
+    sname = os.path.join(fdir, "spectra_forces.npz")
+    if args.reset and os.path.exists(sname):
+        os.remove(sname)
+    state = load_welch(sname, ["cl", "cd"], args.nperseg, dt)
+    with profiling.stage("spectra", folder=fdir) as info:
+        update_welch(state, df.Time.values, df[["cl", "cd"]].values)
+        info["rows"] = int(state["nseg"])
+    save_welch(sname, state)
+    peaks = write_spectra(
+        os.path.join(fdir, "spectra_forces.csv"), state, args.length, umag0
+    )
+    print(f"Force spectra for {fdir} ({state['nseg']} segments of {args.nperseg})")
+    if peaks is not None:
+        print(peaks.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+    del df
+
+    # Probes in the per-step slices (one step in memory at a time)
+    if args.probes is not None:
+        locs = pd.read_csv(args.probes)
+        names = [f"{field}_{i}" for i in range(len(locs)) for field in args.fields]
+        steps = manifest.get_manifest(os.path.join(fdir, args.slices))["steps"]
+        if args.dt is None and len(steps) > 1:
+            dt = np.median(np.diff([step["time"] for step in steps]))
+
+        pname = os.path.join(fdir, "spectra_probes.npz")
+        if args.reset and os.path.exists(pname):
+            os.remove(pname)
+        state = load_welch(pname, names, args.nperseg, dt)
+        renames = utilities.get_renames()
+        coords = None
+        with profiling.stage("probes", folder=fdir) as info:
+            pending = [
+                (
+                    step["time"],
+                    [os.path.join(fdir, args.slices, f) for f in step["shards"]],
+                )
+                for step in steps
+                if not step["time"] <= state["t_last"]
+            ]
+            for time, sdf in utilities.iter_merged_csv(pending):
+                sdf = sdf.rename(columns=renames)
+
+                # the slices do not move: reuse the trees
+                cols = [args.slice] + list(args.plane)
+                if coords is None or not np.array_equal(coords, sdf[cols].values):
+                    coords = sdf[cols].values
+                    trees = probes.build_slice_trees(sdf, args.slice, args.plane)
+                vals = probes.probe_points(
+                    trees,
+                    sdf,
+                    args.fields,
+                    locs[args.slice].values,
+                    locs[args.plane].values,
+                )
+                update_welch(state, [time], vals.values.ravel()[None, :])
+                info["rows"] = info.get("rows", 0) + 1
+                del sdf
+        save_welch(pname, state)
+        peaks = write_spectra(
+            os.path.join(fdir, "spectra_probes.csv"), state, args.length, umag0
+        )
+        print(f"Probe spectra ({state['nseg']} segments of {args.nperseg})")
+        if peaks is not None:
+            print(peaks.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import re
+import sys
+import glob
+import numpy as np
+from mcalister import definitions as defs
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_merged_csv(fnames, **kwargs):
+    """Concatenate csv files (compressed files, .gz or .zst, are
+    decompressed on the fly)"""
+    import pandas as pd
+
+    lst = []
+    for fname in fnames:
+        try:
+            df = pd.read_csv(fname, **kwargs)
+            lst.append(df)
+        except pd.io.common.EmptyDataError:
+            pass
+    return pd.concat(lst, ignore_index=True)
+
+
+# ========================================================================
+def iter_merged_csv(steps, **kwargs):
+    """Read the shards of each step (time index, shard files) in turn
+
+    The next step is read and decompressed in a background thread while
+    the caller processes the current one.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = None
+        for k, (time, fnames) in enumerate(steps):
+            if future is None:
+                future = executor.submit(get_merged_csv, fnames, **kwargs)
+            df = future.result()
+            future = None
+            if k + 1 < len(steps):
+                future = executor.submit(get_merged_csv, steps[k + 1][1], **kwargs)
+            yield time, df
+
+
+# ========================================================================
+def get_compression_suffixes():
+    """File suffixes of the supported compressions"""
+    return {"gzip": ".gz", "zstd": ".zst"}
+
+
+# ========================================================================
+def compress_file(fname, method="gzip", level=None):
+    """Compress a file in place (fname is replaced by fname.gz/.zst)
+
+    The modification time is kept since it is used to detect the stale
+    steps of restarted runs.
+    """
+    import shutil
+
+    oname = fname + get_compression_suffixes()[method]
+    tname = oname + ".tmp"
+    with open(fname, "rb") as src:
+        if method == "gzip":
+            import gzip
+
+            with gzip.open(tname, "wb", compresslevel=level or 6) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        elif method == "zstd":
+            try:
+                import zstandard
+            except ImportError as exc:
+                raise ImportError("zstd compression needs zstandard") from exc
+
+            cctx = zstandard.ZstdCompressor(level=level or 3, threads=-1)
+            with open(tname, "wb") as dst:
+                cctx.copy_stream(src, dst)
+    shutil.copystat(fname, tname)
+    os.replace(tname, oname)
+    os.remove(fname)
+    return oname
+
+
+# ========================================================================
+def get_contour(x, y, segments, decimals=5):
+    """Order points by walking the line segments connecting them
+
+    The segments are given as an array of [x0, y0, x1, y1] rows. The
+    endpoints are matched to the points by their (rounded)
+    coordinates so that duplicate segments (e.g. from different ranks)
+    are handled. Returns the indices of the points in contour order,
+    with the first index repeated at the end if the contour is closed.
+    When the segments form several pieces, they are chained by their
+    nearest end points.
+    """
+    import pandas as pd
+
+    # Match segment end points to the points
+    index = pd.MultiIndex.from_arrays(
+        [np.round(x, decimals), np.round(y, decimals)]
+    ).drop_duplicates()
+    npts = len(x)
+    pts = pd.MultiIndex.from_arrays([np.round(x, decimals), np.round(y, decimals)])
+    lookup = index.get_indexer(pts)
+    first = np.full(len(index), -1)
+    first[lookup[::-1]] = np.arange(npts)[::-1]
+    segments = np.round(np.asarray(segments), decimals)
+    a = index.get_indexer(pd.MultiIndex.from_arrays([segments[:, 0], segments[:, 1]]))
+    b = index.get_indexer(pd.MultiIndex.from_arrays([segments[:, 2], segments[:, 3]]))
+    valid = (a >= 0) & (b >= 0) & (a != b)
+    edges = np.unique(np.sort(np.column_stack((a[valid], b[valid])), axis=1), axis=0)
+
+    # Neighbors of each point (at most two on a contour)
+    nbrs = np.full((len(index), 2), -1)
+    degree = np.zeros(len(index), dtype=int)
+    for i, j in edges:
+        if degree[i] < 2:
+            nbrs[i, degree[i]] = j
+        if degree[j] < 2:
+            nbrs[j, degree[j]] = i
+        degree[i] += 1
+        degree[j] += 1
+
+    # Walk each connected piece, starting at an end if it is open
+    visited = np.zeros(len(index), dtype=bool)
+    pieces = []
+    for start in np.concatenate(
+        (np.flatnonzero(degree == 1), np.flatnonzero(degree > 1))
+    ):
+        if visited[start]:
+            continue
+        piece = [start]
+        visited[start] = True
+        prev, cur = -1, start
+        while True:
+            nxt = nbrs[cur, 0] if nbrs[cur, 0] != prev else nbrs[cur, 1]
+            if nxt < 0:
+                break
+            piece.append(nxt)
+            if nxt == start or visited[nxt]:
+                break
+            visited[nxt] = True
+            prev, cur = cur, nxt
+        pieces.append(piece)
+
+    # Chain the pieces (e.g. a cut broken by blanked cells) by their
+    # nearest end points
+    pieces.sort(key=len, reverse=True)
+    xy = np.column_stack((x, y))[first]
+    order = pieces.pop(0)
+    while len(pieces) > 0:
+        tail = xy[order[-1]]
+        dist = [
+            min(np.hypot(*(xy[p[0]] - tail)), np.hypot(*(xy[p[-1]] - tail)))
+            for p in pieces
+        ]
+        piece = pieces.pop(int(np.argmin(dist)))
+        if np.hypot(*(xy[piece[-1]] - tail)) < np.hypot(*(xy[piece[0]] - tail)):
+            piece = piece[::-1]
+        order += piece
+
+    missing = np.count_nonzero(~visited[lookup])
+    if missing > 0:
+        print(
+            f"Warning: {missing} of {npts} points are not on the contour segments",
+            file=sys.stderr,
+        )
+    return first[np.array(order)]
+
+
+# ========================================================================
+def split_contour(x, y, order):
+    """Split a closed contour into upper and lower surfaces
+
+    The trailing edge is the point with the largest x and the leading
+    edge is the point furthest away from the trailing edge. Both
+    surfaces are returned as indices ordered from leading edge to
+    trailing edge.
+    """
+    if order[0] == order[-1]:
+        order = order[:-1]
+    te = np.argmax(x[order])
+    order = np.roll(order, -te)
+    le = np.argmax((x[order] - x[order[0]]) ** 2 + (y[order] - y[order[0]]) ** 2)
+
+    first = order[le::-1]
+    second = np.append(order[le:], order[0])
+    if y[first].mean() > y[second].mean():
+        return first, second
+    else:
+        return second, first
+
+
+# ========================================================================
+def read_forces(fname):
+    """Read a forces file, skipping the headers repeated by restarts"""
+    import pandas as pd
+
+    df = pd.read_csv(fname, sep=r"\s+")
+    if not pd.api.types.is_numeric_dtype(df.Time):
+        df = df[df.Time != "Time"].astype(float)
+    return df
+
+
+# ========================================================================
+def get_forces_files(fdir, fname="forces.dat"):
+    """Forces fragments of a run (forces.dat, forces.dat.*) in the order
+    they were written"""
+    return sorted(
+        (
+            f
+            for f in glob.glob(os.path.join(fdir, fname + "*"))
+            if not f.endswith(".npz")
+        ),
+        key=os.path.getmtime,
+    )
+
+
+# ========================================================================
+def get_forces_signature(fnames):
+    """Signature (size and modification time) of the forces fragments"""
+    return np.array([[os.path.getsize(f), os.path.getmtime(f)] for f in fnames])
+
+
+# ========================================================================
+def get_forces(fdir, fname="forces.dat"):
+    """Load the forces time series of a run, merged across restarts
+
+    All the fragments (forces.dat, forces.dat.*) are concatenated in the
+    order they were written and, for duplicated times, the latest value
+    is kept. The result is cached in a compacted binary file that is
+    used as long as the fragments do not change.
+    """
+    import pandas as pd
+
+    fnames = get_forces_files(fdir, fname)
+    signature = get_forces_signature(fnames)
+
+    # Use the compacted copy if it is up to date
+    cname = os.path.join(fdir, fname + ".npz")
+    try:
+        with np.load(cname, allow_pickle=False) as dat:
+            if np.array_equal(dat["signature"], signature):
+                return pd.DataFrame(dat["data"], columns=dat["columns"])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    # Merge the fragments and keep the last value of duplicated times
+    df = pd.concat([read_forces(f) for f in fnames], ignore_index=True)
+    time = df.Time.values[::-1]
+    _, idx = np.unique(time, return_index=True)
+    df = df.iloc[len(df) - 1 - idx].reset_index(drop=True)
+
+    np.savez(
+        cname,
+        signature=signature,
+        columns=np.array(df.columns, dtype=str),
+        data=df.values,
+    )
+    return df
+
+
+# ========================================================================
+def parse_ic(fname):
+    """Parse the Nalu yaml input file for the initial conditions"""
+    import yaml
+
+    with open(fname, "r") as stream:
+        try:
+            dat = yaml.safe_load(stream)
+            u0 = float(
+                dat["realms"][0]["initial_conditions"][0]["value"]["velocity"][0]
+            )
+            v0 = float(
+                dat["realms"][0]["initial_conditions"][0]["value"]["velocity"][1]
+            )
+            try:
+                w0 = float(
+                    dat["realms"][0]["initial_conditions"][0]["value"]["velocity"][2]
+                )
+            except IndexError:
+                w0 = 0.0
+            umag = np.sqrt(u0 ** 2 + v0 ** 2 + w0 ** 2)
+            rho0 = float(
+                dat["realms"][0]["material_properties"]["specifications"][0]["value"]
+            )
+            mu = float(
+                dat["realms"][0]["material_properties"]["specifications"][1]["value"]
+            )
+            return u0, v0, w0, umag, rho0, mu
+
+        except yaml.YAMLError as exc:
+            print(exc)
+
+
+# ========================================================================
+def get_wing_slices(dim):
+    """Return the wing slices"""
+    import pandas as pd
+
+    return pd.DataFrame(defs.get_wing_slices(dim), columns=["zslice"])
+
+
+# ========================================================================
+def get_vortex_slices():
+    """Return the vortex slices"""
+    import pandas as pd
+
+    return pd.DataFrame(defs.get_vortex_slices(), columns=["xslice"])
+
+
+# ========================================================================
+def rotate_to_freestream(df, aoa, x0=1, y0=0):
+    """Add the coordinates (xr, yr) and velocities (uxr, uyr) in the
+    frame aligned with the freestream (rotation about (x0, y0))"""
+    c, s = np.cos(np.radians(aoa)), np.sin(np.radians(aoa))
+    df["xr"] = c * (df.x - x0) + s * (df.y - y0) + x0
+    df["yr"] = -s * (df.x - x0) + c * (df.y - y0) + y0
+    df["uxr"] = c * df.ux + s * df.uy
+    df["uyr"] = -s * df.ux + c * df.uy
+    if "ux_se" in df.columns:
+        # neglects the correlation of the errors of ux and uy
+        df["uxr_se"] = np.sqrt((c * df.ux_se) ** 2 + (s * df.uy_se) ** 2)
+        df["uyr_se"] = np.sqrt((s * df.ux_se) ** 2 + (c * df.uy_se) ** 2)
+    return df
+
+
+# ========================================================================
+def get_renames():
+    return {
+        "Points:0": "x",
+        "Points:1": "y",
+        "Points:2": "z",
+        "pressure": "p",
+        "iblank": "iblank",
+        "absIBlank": "absIBlank",
+        "pressure_force_:0": "fpx",
+        "pressure_force_:1": "fpy",
+        "pressure_force_:2": "fpz",
+        "tau_wall": "tau_wall",
+        "velocity_:0": "ux",
+        "velocity_:1": "uy",
+        "velocity_:2": "uz",
+        "time": "avg_time",
+        "GlobalNodeId": "GlobalNodeId",
+        "PedigreeNodeId": "PedigreeNodeId",
+        "uxux": "uxux",
+        "uxuy": "uxuy",
+        "uxuz": "uxuz",
+        "uyuy": "uyuy",
+        "uyuz": "uyuz",
+        "uzuz": "uzuz",
+        "pp": "pp",
+        "ux_rms": "ux_rms",
+        "uy_rms": "uy_rms",
+        "uz_rms": "uz_rms",
+        "p_rms": "p_rms",
+        "ux_se": "ux_se",
+        "uy_se": "uy_se",
+        "uz_se": "uz_se",
+        "p_se": "p_se",
+    }
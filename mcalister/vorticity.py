@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+#
+# Axial vorticity, Q-criterion and circulation on the vortex slices.
+# The in-plane gradients are computed with a least squares operator
+# assembled once per slice geometry as sparse matrices so that applying
+# it to another field or time step is a sparse matrix product.
+
+
+# ========================================================================
+#
+# Imports
+#
+# ========================================================================
+import os
+import pickle
+import hashlib
+import argparse
+import numpy as np
+from mcalister import utilities
+from mcalister import definitions as defs
+from mcalister import manifest
+from mcalister import profiling
+
+
+# ========================================================================
+#
+# Function definitions
+#
+# ========================================================================
+def get_geometry_key(points, decimals=6):
+    """Hash of the (rounded) point coordinates of a slice"""
+    points = np.ascontiguousarray(np.round(points, decimals), dtype=np.float64)
+    sha = hashlib.sha1()
+    sha.update(str(points.shape).encode())
+    sha.update(points.tobytes())
+    return sha.hexdigest()
+
+
+# ========================================================================
+def build_gradient_operator(points, k=9):
+    """Sparse least squares gradient operator on scattered 2D points
+
+    The gradient at each point is the inverse distance weighted least
+    squares fit of the differences with its k-1 nearest neighbors.
+    Returns the matrices (CSR) of the derivatives along each coordinate
+    and the area of each point (a third of the area of the Delaunay
+    triangles it belongs to) for the integrals over the slice.
+    """
+    import scipy.sparse as sp
+    import scipy.spatial as sps
+
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    k = min(k, n)
+    dist, idx = sps.cKDTree(points).query(points, k=k)
+    nbrs = idx[:, 1:]
+    weights = 1.0 / np.maximum(dist[:, 1:], 1e-12)
+    dx = (points[nbrs] - points[:, None, :]) * weights[:, :, None]
+    coefs = np.linalg.pinv(dx) * weights[:, None, :]
+
+    rows = np.repeat(np.arange(n), k - 1)
+    ops = []
+    for d in range(points.shape[1]):
+        op = sp.csr_matrix((coefs[:, d, :].ravel(), (rows, nbrs.ravel())), (n, n))
+        ops.append((op - sp.diags(coefs[:, d, :].sum(axis=1))).tocsr())
+
+    tri = sps.Delaunay(points)
+    corners = points[tri.simplices]
+    e1, e2 = corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+    tarea = 0.5 * np.fabs(e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0])
+    areas = np.bincount(
+        tri.simplices.ravel(), weights=np.repeat(tarea / 3, 3), minlength=n
+    )
+    return {"grad": ops, "areas": areas}
+
+
+# ========================================================================
+def get_gradient_operator(points, cdir=None, k=9):
+    """Return the gradient operator of a slice, loading it from disk if
+    possible
+
+    The operator is cached in cdir under the hash of the point
+    coordinates so that every field and time step sharing the slice
+    geometry (including the averaged slices) reuses it.
+    """
+    key = get_geometry_key(points)
+    if cdir is None:
+        return build_gradient_operator(points, k)
+
+    cname = os.path.join(cdir, f"gradient_{key[:16]}.pkl")
+    signature = (key, k)
+    try:
+        with open(cname, "rb") as f:
+            cached = pickle.load(f)
+        if cached["signature"] == signature:
+            return cached["operator"]
+    except (OSError, EOFError, pickle.UnpicklingError, KeyError):
+        pass
+
+    operator = build_gradient_operator(points, k)
+    os.makedirs(cdir, exist_ok=True)
+    with open(cname, "wb") as f:
+        pickle.dump({"signature": signature, "operator": operator}, f)
+    return operator
+
+
+# ========================================================================
+def get_vortex_fields(operator, v, w):
+    """Axial vorticity and Q-criterion from the in-plane velocities
+
+    v and w are the velocities along the two in-plane coordinates (in
+    this order, the axis being their cross product). v and w can have
+    one column per time step. Q is computed from the in-plane velocity
+    gradient tensor, 0.5 (|Omega|^2 - |S|^2).
+    """
+    da, db = operator["grad"]
+    va, vb, wa, wb = da @ v, db @ v, da @ w, db @ w
+    omega = wa - vb
+    q = -0.5 * (va ** 2 + wb ** 2) - vb * wa
+    return omega, q
+
+
+# ========================================================================
+def get_circulation(points, omega, areas, center, radii):
+    """Circulation (integral of the axial vorticity) inside circles of
+    the given radii around center"""
+    r = np.linalg.norm(np.asarray(points) - np.asarray(center), axis=1)
+    order = np.argsort(r)
+    cumulative = np.concatenate(([0.0], np.cumsum((omega * areas)[order])))
+    return cumulative[np.searchsorted(r[order], radii, side="right")]
+
+
+# ========================================================================
+def get_max_radius(points, center):
+    """Radius of the largest circle around center inside the slice"""
+    lo, hi = np.min(points, axis=0), np.max(points, axis=0)
+    return max(0.0, np.min(np.concatenate((center - lo, hi - center))))
+
+
+# ========================================================================
+def get_step_slices(df, aoa, xslices, decimals=5):
+    """Rows of each vortex slice of a per-step dataframe
+
+    Duplicate points (on the boundaries of the ranks) are averaged and
+    sorted like the averaged slices so that the slices share their
+    geometry, and gradient operator, with them.
+    """
+    df = df.groupby(["x", "y", "z"]).mean().reset_index()
+    df.z -= defs.get_half_wing_length()
+    utilities.rotate_to_freestream(df, aoa)
+    keys = np.round(df.xr.values, decimals)
+    return [
+        df[keys == np.round(xslicet, decimals)].reset_index(drop=True)
+        for xslicet in xslices
+    ]
+
+
+# ========================================================================
+#
+# Main
+#
+# ========================================================================
+def main():
+    """Vortex quantities of each per-step vortex slice"""
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(
+        description="Vorticity, Q-criterion and circulation history of the vortex"
+    )
+    parser.add_argument(
+        "-f", "--folder", help="Folder where files are stored", type=str, required=True
+    )
+    parser.add_argument(
+        "-n", "--navg", help="Number of (last) time steps", type=int, default=None
+    )
+    parser.add_argument(
+        "-r",
+        "--radii",
+        help="Radii (chords) of the circulations",
+        nargs="+",
+        type=float,
+        default=[0.05, 0.1],
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.setup(args)
+
+    import pandas as pd
+
+    # Setup
+    fdir = os.path.abspath(args.folder)
+    sdir = os.path.join(fdir, "vortex_slices")
+    cdir = os.path.join(sdir, "slices")
+    yname = os.path.join(fdir, "mcalister.yaml")
+    u0, v0, w0, umag0, rho0, mu = utilities.parse_ic(yname)
+    aoa = defs.get_aoa(fdir)
+    chord = 1
+    xslices = (utilities.get_vortex_slices().xslice + 1).values
+
+    steps = manifest.get_manifest(sdir)["steps"]
+    if args.navg is not None:
+        steps = steps[-args.navg :]
+    pending = [
+        (step["time"], [os.path.join(sdir, f) for f in step["shards"]])
+        for step in steps
+    ]
+
+    renames = utilities.get_renames()
+    operators = {}
+    lst = []
+    with profiling.stage("vorticity", folder=fdir) as info:
+        for time, df in utilities.iter_merged_csv(pending):
+            df = df.rename(columns=renames)
+            for xslicet, subdf in zip(xslices, get_step_slices(df, aoa, xslices)):
+                if len(subdf) < 3:
+                    continue
+                points = subdf[["yr", "z"]].values
+                key = get_geometry_key(points)
+                if key not in operators:
+                    operators[key] = get_gradient_operator(points, cdir)
+                operator = operators[key]
+
+                omega, q = get_vortex_fields(
+                    operator, subdf.uyr.values, subdf.uz.values
+                )
+                idx = subdf.p.idxmin()
+                center = points[idx]
+                gamma = get_circulation(
+                    points,
+                    omega,
+                    operator["areas"],
+                    center,
+                    np.array(args.radii) * chord,
+                )
+                row = {
+                    "time": time,
+                    "x": xslicet,
+                    "yc": center[0],
+                    "zc": center[1],
+                    "pc": subdf.p[idx],
+                    "omega_max": np.max(np.fabs(omega)) * chord / umag0,
+                    "q_max": np.max(q) * (chord / umag0) ** 2,
+                }
+                for r, g in zip(args.radii, gamma):
+                    row[f"gamma_{r:g}"] = g / (umag0 * chord)
+                lst.append(row)
+            info["rows"] = info.get("rows", 0) + 1
+            del df
+
+    oname = os.path.join(sdir, "vortex_history.csv")
+    pd.DataFrame(lst).to_csv(oname, index=False)
+    print(f"Vortex history of {len(steps)} steps written to {oname}")
+
+
+# ========================================================================
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import numpy as np
+from mcalister import manifest
+
+
+def write_case(cdir, nsteps=10, nranks=2):
+    """Case folder with the input file and the shards of each step"""
+    sdir = os.path.join(cdir, "wing_slices")
+    os.makedirs(sdir)
+    with open(os.path.join(cdir, "mcalister.yaml"), "w") as f:
+        f.write(
+            "Time_Integrators:\n"
+            "  - StandardTimeIntegrator:\n"
+            "      start_time: 0\n"
+            "      time_step: 0.01\n"
+            "realms:\n"
+            "  - output:\n"
+            "      output_frequency: 20\n"
+        )
+    for step in range(nsteps):
+        for rank in range(nranks):
+            with open(os.path.join(sdir, f"output{rank}.{step}.csv"), "w") as f:
+                f.write("x,y\n0,0\n")
+    return sdir
+
+
+def write_restart(cdir, times):
+    """Restart file with the periodic restart dumps"""
+    from scipy.io import netcdf_file
+
+    os.makedirs(os.path.join(cdir, "rst"))
+    with netcdf_file(os.path.join(cdir, "rst", "mcalister.rst"), "w") as f:
+        f.createDimension("time_step", None)
+        var = f.createVariable("time_whole", "d", ("time_step",))
+        var[:] = times
+
+
+def test_periodic_restart_dumps_keep_all_steps(tmp_path):
+    cdir = str(tmp_path / "SST-12")
+    sdir = write_case(cdir)
+    write_restart(cdir, np.linspace(0.2, 2.0, 10))
+    fname = os.path.join(sdir, "output0.3.csv")
+    stat = os.stat(fname)
+    os.utime(fname, (stat.st_atime + 100, stat.st_mtime + 100))
+
+    dat = manifest.get_manifest(sdir)
+    assert [s["index"] for s in dat["steps"]] == list(range(10))
+    assert np.allclose([s["time"] for s in dat["steps"]], 0.2 * np.arange(10))
+    assert dat["dropped"] == []
+
+
+def test_incomplete_step_is_dropped(tmp_path):
+    cdir = str(tmp_path / "SST-12")
+    sdir = write_case(cdir)
+    os.remove(os.path.join(sdir, "output1.7.csv"))
+
+    dat = manifest.get_manifest(sdir)
+    assert [s["index"] for s in dat["steps"]] == [0, 1, 2, 3, 4, 5, 6, 8, 9]
+    assert [d["index"] for d in dat["dropped"]] == [7]
+
+
+def test_manifest_is_reused_until_the_folder_changes(tmp_path):
+    cdir = str(tmp_path / "SST-12")
+    sdir = write_case(cdir, nsteps=3)
+    mtime = os.stat(sdir).st_mtime_ns
+
+    dat = manifest.get_manifest(sdir)
+    assert os.stat(sdir).st_mtime_ns == mtime
+    assert os.path.exists(manifest.get_manifest_file(sdir))
+    assert manifest.get_manifest(sdir) == dat
+
+    for rank in range(2):
+        with open(os.path.join(sdir, f"output{rank}.3.csv"), "w") as f:
+            f.write("x,y\n0,0\n")
+    os.utime(sdir, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    assert len(manifest.get_manifest(sdir)["steps"]) == 4
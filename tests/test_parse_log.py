@@ -0,0 +1,35 @@
+from mcalister import parse_log
+
+log = """
+*******************************************************
+Time Step Count: 1 Current Time: 0.01
+ WallClockTime: 1 Pre: 0.5 Sol: 2 Post: 0.5
+*******************************************************
+Timing for Eq: MomentumEQS
+             init --    avg: 0.1 	min: 0.1 	max: 0.2
+         assemble --    avg: 3 	min: 2.5 	max: 3.5
+Timing for Eq: ContinuityEQS
+             init --    avg: 0.2 	min: 0.1 	max: 0.3
+         assemble --    avg: 1 	min: 0.5 	max: 1.5
+Timing for IO:
+   io create mesh --    avg: 4 	min: 4 	max: 4
+Timing for Simulation: nprocs= 36
+           main() --    avg: 100 	min: 100 	max: 100
+"""
+
+
+def test_timer_tables_of_each_equation(tmp_path):
+    fname = tmp_path / "mcalister.o"
+    fname.write_text(log)
+
+    steps, solves, timers, nprocs = parse_log.parse_log(str(fname))
+    assert nprocs == 36
+    assert steps.wall_time.tolist() == [3.0]
+    assert timers.table.unique().tolist() == [
+        "MomentumEQS",
+        "ContinuityEQS",
+        "IO",
+        "Simulation",
+    ]
+    assemble = timers[timers.timer == "assemble"].set_index("table")["avg"]
+    assert assemble.to_dict() == {"MomentumEQS": 3.0, "ContinuityEQS": 1.0}
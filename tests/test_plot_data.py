@@ -0,0 +1,28 @@
+import os
+import numpy as np
+from mcalister import plot_data
+
+
+def test_cache_follows_the_content(tmp_path):
+    fname = str(tmp_path / "avg_slice.csv")
+    cname = str(tmp_path / "plot.npz")
+    with open(fname, "w") as f:
+        f.write("x,p\n0,1\n")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        with open(fname) as f:
+            return {"p": np.array([float(f.read().split(",")[-1])])}
+
+    assert plot_data.get_plot_data(cname, [fname], compute, n=1)["p"] == [1]
+    assert plot_data.get_plot_data(cname, [fname], compute, n=1)["p"] == [1]
+    assert len(calls) == 1
+
+    # same size and modification time, different content
+    stat = os.stat(fname)
+    with open(fname, "w") as f:
+        f.write("x,p\n0,2\n")
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert plot_data.get_plot_data(cname, [fname], compute, n=1)["p"] == [2]
+    assert len(calls) == 2
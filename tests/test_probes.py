@@ -0,0 +1,19 @@
+import numpy as np
+from mcalister import probes
+
+
+def test_decimate_is_stratified():
+    rng = np.random.default_rng(0)
+    points = rng.random((20000, 2))
+    sel = probes.decimate(points, 500, keep=[7])
+    assert abs(len(sel) - 500) < 0.1 * 500
+    assert 7 in sel
+    # the subsample covers the whole square
+    counts, _, _ = np.histogram2d(*points[sel].T, bins=4)
+    assert counts.min() > 0
+
+
+def test_decimate_coincident_points():
+    points = np.ones((100, 2))
+    sel = probes.decimate(points, 10, keep=[50])
+    assert sel.tolist() == list(range(10)) + [50]
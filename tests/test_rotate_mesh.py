@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from mcalister import exodus
+from mcalister import rotate_mesh
+
+
+def write_mesh(fname, version, combined):
+    """Two block mesh with attributes and a record variable"""
+    from scipy.io import netcdf_file
+
+    with netcdf_file(fname, "w", version=version) as f:
+        f.title = b"mesh"
+        f.api_version = np.array([8.1, 2.0])
+        f.createDimension("time_step", None)
+        f.createDimension("num_nodes", 6)
+        f.createDimension("num_dim", 3)
+        f.createDimension("num_el_blk", 2)
+        f.createDimension("len_name", 33)
+        f.createDimension("num_el_in_blk1", 1)
+        f.createDimension("num_nod_per_el1", 3)
+        f.createDimension("num_el_in_blk2", 1)
+        f.createDimension("num_nod_per_el2", 3)
+        names = np.zeros((2, 33), dtype="S1")
+        for i, name in enumerate([b"base-HEX", b"tipvortex-HEX"]):
+            names[i, : len(name)] = np.frombuffer(name, dtype="S1")
+        f.createVariable("eb_names", "c", ("num_el_blk", "len_name"))[:] = names
+        coords = np.arange(18, dtype=np.float64).reshape(3, 6)
+        if combined:
+            var = f.createVariable("coord", "d", ("num_dim", "num_nodes"))
+            var[:] = coords
+        else:
+            for name, row in zip("xyz", coords):
+                var = f.createVariable(f"coord{name}", "d", ("num_nodes",))
+                var.units = b"m"
+                var[:] = row
+        var = f.createVariable("connect1", "i", ("num_el_in_blk1", "num_nod_per_el1"))
+        var.elem_type = b"TRI3"
+        var[:] = [[1, 2, 3]]
+        var = f.createVariable("connect2", "i", ("num_el_in_blk2", "num_nod_per_el2"))
+        var[:] = [[4, 5, 6]]
+        f.createVariable("time_whole", "d", ("time_step",))[:2] = [0.0, 0.1]
+    return coords.T
+
+
+@pytest.mark.parametrize("version", [1, 2])
+@pytest.mark.parametrize("combined", [False, True])
+def test_rotate_block(tmp_path, version, combined):
+    iname = str(tmp_path / "mesh.exo")
+    coords = write_mesh(iname, version, combined)
+    onames = [str(tmp_path / f"mesh_{a}.exo") for a in [12, 90]]
+    rotate_mesh.rotate_mesh(
+        iname, onames, [12, 90], ["tipvortex-HEX"], [1, 0, 0], [0, 0, 1]
+    )
+
+    for angle, oname in zip([12, 90], onames):
+        with exodus.open_exodus(oname) as f:
+            new = np.array(exodus.get_coordinates(f))
+            assert exodus.get_times(f).tolist() == [0.0, 0.1]
+        rot = rotate_mesh.get_rotation_matrix(angle, [0, 0, 1])
+        expected = coords.copy()
+        expected[3:] = (coords[3:] - [1, 0, 0]) @ rot.T + [1, 0, 0]
+        assert np.allclose(new, expected)